@@ -1,3 +1,7 @@
+import csv
+import sys
+
+
 class Movie:
     def __init__(self, t="", y=-1, g=""):
         self.__title = t
@@ -22,6 +26,23 @@ class Movie:
     def set_genre(self, value):
         self.__genre = value
 
+    # Streams movies from (title, year, genre) rows, nothing is materialized. The few distinct
+    # genres are interned, so all records share one string per genre.
+    @classmethod
+    def from_rows(cls, rows):
+        intern = sys.intern
+        for title, year, genre in rows:
+            yield cls(title, int(year), intern(genre))
+
+    # Streams movies from a title,year,genre CSV file, row by row
+    @classmethod
+    def from_csv(cls, path, header=True):
+        with open(path, newline="") as file:
+            reader = csv.reader(file)
+            if header:
+                next(reader, None)
+            yield from cls.from_rows(reader)
+
     def print_details(self):
         print("Title:", self.get_title())
         print("Year:", self.get_year())
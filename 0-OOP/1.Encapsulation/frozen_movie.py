@@ -0,0 +1,133 @@
+'''
+FrozenMovie: an immutable, tuple-backed variant of Movie.
+
+Every Movie carries a __dict__ holding _Movie__title, _Movie__year and _Movie__genre, and every
+read is a get_* method call. FrozenMovie is a tuple subclass with __slots__ = (): no __dict__,
+the three fields live in the tuple itself and are read through properties
+
+    movie.title, movie.year, movie.genre
+
+The get_* methods and print_details are kept, so code written against Movie still works for
+reading. There are no setters, replace() returns a new FrozenMovie instead. The data stays
+encapsulated: a tuple can not be modified in place.
+
+from_rows / from_csv are the same streaming loaders as Movie's: one record is built per row
+while the file is read, no list of rows is materialized.
+'''
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from operator import itemgetter
+
+from encapsulation import Movie
+from movie_catalog import random_rows
+
+
+class FrozenMovie(tuple):
+    __slots__ = ()
+
+    def __new__(cls, t="", y=-1, g=""):
+        return tuple.__new__(cls, (t, y, g))
+
+    title = property(itemgetter(0))
+    year = property(itemgetter(1))
+    genre = property(itemgetter(2))
+
+    # Movie interface, read only
+    def get_title(self):
+        return self[0]
+
+    def get_year(self):
+        return self[1]
+
+    def get_genre(self):
+        return self[2]
+
+    print_details = Movie.print_details
+
+    def replace(self, title=None, year=None, genre=None):
+        return FrozenMovie(self[0] if title is None else title,
+                           self[1] if year is None else year,
+                           self[2] if genre is None else genre)
+
+    def __repr__(self):
+        return f"FrozenMovie({self[0]!r}, {self[1]!r}, {self[2]!r})"
+
+    # Same as Movie.from_rows, but builds the tuple directly instead of going through __new__
+    @classmethod
+    def from_rows(cls, rows):
+        new = tuple.__new__
+        intern = sys.intern
+        for title, year, genre in rows:
+            yield new(cls, (title, int(year), intern(genre)))
+
+    from_csv = classmethod(Movie.from_csv.__func__)
+
+    # Movie <-> FrozenMovie
+    @classmethod
+    def from_movie(cls, movie: Movie):
+        return cls(movie.get_title(), movie.get_year(), movie.get_genre())
+
+    def to_movie(self):
+        return Movie(*self)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("title", "year", "genre"))
+        writer.writerows(rows)
+
+
+def bytes_per_record(cls, path, sample):
+    records = []
+    tracemalloc.start()
+    for movie in cls.from_csv(path):
+        records.append(movie)
+        if len(records) == sample:
+            break
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(records)
+
+
+def records_per_second(cls, path):
+    count = 0
+    start = time.perf_counter()
+    for _ in cls.from_csv(path):
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def benchmark(rows=10_000_000, sample=200_000):
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_csv(path, random_rows(rows))
+        print(f"{rows} rows, {os.path.getsize(path) / 1e6:.0f} MB csv")
+        for cls in (Movie, FrozenMovie):
+            # bytes/record includes the title and genre strings of every record
+            size = bytes_per_record(cls, path, sample)
+            rate = records_per_second(cls, path)
+            print(f"{cls.__name__:12}: {size:6.1f} bytes/record, {rate / 1e6:5.2f} M records/s loaded")
+        movie, frozen = Movie("x", 1, "y"), FrozenMovie("x", 1, "y")
+        print(f"object alone: Movie {sys.getsizeof(movie) + sys.getsizeof(vars(movie))} bytes, "
+              f"FrozenMovie {sys.getsizeof(frozen)} bytes")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    movie = FrozenMovie("The Lion King", 1994, "Adventure")
+    movie.print_details()
+    print(movie.title, movie.year)
+    print(movie.replace(title="Forrest Gump", genre="Drama"))
+    try:
+        movie.title = "Toy Story"
+    except AttributeError as error:
+        print("immutable:", error)
+
+    benchmark()
@@ -0,0 +1,257 @@
+'''
+MovieCatalog: a columnar store of many Movie records with secondary indexes.
+
+A Movie object is a __dict__ with three name-mangled fields. The catalog keeps one column per
+field instead
+
+    titles      list of str
+    years       array('i')
+    genres      array('H'), an id into the list of distinct genres
+
+and two indexes with the same layout, a YearIndex
+
+    years       sorted array of the distinct years present
+    buckets     year -> sorted array('I') of the movie ids with that year
+
+one over every movie and one per genre (the inverted index). "genre=X and year in [a, b]" is a
+binary search for a in the genre's sorted years, then a walk over the buckets up to b: the cost
+depends on the number of years and matches in the range, not on the catalog size.
+
+catalog[movie_id] returns a MovieRecord, a Movie whose getters read the columns and whose
+set_title / set_year / set_genre write them and move the id between buckets, so the indexes
+are always consistent. Encapsulation is kept: callers only see the Movie interface.
+'''
+import random
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from encapsulation import Movie
+
+
+class YearIndex:
+    def __init__(self):
+        self.years = array("i")
+        self.buckets = {}
+
+    def add(self, year, movie_id):
+        bucket = self.buckets.get(year)
+        if bucket is None:
+            bucket = self.buckets[year] = array("I")
+            insort(self.years, year)
+        # ids are kept sorted, so both add and remove are a binary search plus one memmove;
+        # new movies have the largest id and are simply appended
+        if not bucket or bucket[-1] < movie_id:
+            bucket.append(movie_id)
+        else:
+            insort(bucket, movie_id)
+
+    def remove(self, year, movie_id):
+        bucket = self.buckets[year]
+        del bucket[bisect_left(bucket, movie_id)]
+        if not bucket:
+            del self.buckets[year]
+            del self.years[bisect_left(self.years, year)]
+
+    def _range(self, first, last):
+        start = 0 if first is None else bisect_left(self.years, first)
+        stop = len(self.years) if last is None else bisect_right(self.years, last)
+        return self.years[start:stop]
+
+    # ids with first <= year <= last, ordered by year, then id
+    def ids(self, first=None, last=None):
+        result = array("I")
+        for year in self._range(first, last):
+            result.extend(self.buckets[year])
+        return result
+
+    def count(self, first=None, last=None):
+        return sum(len(self.buckets[year]) for year in self._range(first, last))
+
+
+class MovieRecord(Movie):
+    # View of one row; built by MovieCatalog, Movie.__init__ is not called
+    def __init__(self, catalog, movie_id):
+        self._catalog = catalog
+        self.movie_id = movie_id
+
+    def get_title(self):
+        return self._catalog._titles[self.movie_id]
+
+    def set_title(self, value):
+        self._catalog._titles[self.movie_id] = value
+
+    def get_year(self):
+        return self._catalog._years[self.movie_id]
+
+    def set_year(self, value):
+        self._catalog._set_year(self.movie_id, value)
+
+    def get_genre(self):
+        return self._catalog._genre_names[self._catalog._genres[self.movie_id]]
+
+    def set_genre(self, value):
+        self._catalog._set_genre(self.movie_id, value)
+
+    def __repr__(self):
+        return f"MovieRecord({self.get_title()!r}, {self.get_year()}, {self.get_genre()!r})"
+
+
+class MovieCatalog:
+    def __init__(self):
+        self._titles = []
+        self._years = array("i")
+        self._genres = array("H")
+        self._genre_names = []
+        self._genre_ids = {}
+        self._year_index = YearIndex()
+        self._genre_index = []
+
+    def _genre_id(self, genre):
+        genre_id = self._genre_ids.get(genre)
+        if genre_id is None:
+            genre_id = self._genre_ids[genre] = len(self._genre_names)
+            self._genre_names.append(genre)
+            self._genre_index.append(YearIndex())
+        return genre_id
+
+    def add(self, title="", year=-1, genre=""):
+        movie_id = len(self._titles)
+        # typed columns first: a year or genre they can not hold raises before anything else
+        # has changed, so the columns always have the same length
+        self._years.append(year)
+        try:
+            self._genres.append(self._genre_id(genre))
+        except BaseException:
+            self._years.pop()
+            raise
+        genre_id = self._genres[-1]
+        year = self._years[-1]
+        self._titles.append(title)
+        self._year_index.add(year, movie_id)
+        self._genre_index[genre_id].add(year, movie_id)
+        return movie_id
+
+    def add_movie(self, movie: Movie):
+        return self.add(movie.get_title(), movie.get_year(), movie.get_genre())
+
+    @classmethod
+    def from_rows(cls, rows):
+        catalog = cls()
+        for title, year, genre in rows:
+            catalog.add(title, year, genre)
+        return catalog
+
+    @classmethod
+    def from_movies(cls, movies):
+        return cls.from_rows((m.get_title(), m.get_year(), m.get_genre()) for m in movies)
+
+    # Both setters write the typed column first, if the value is rejected the indexes are untouched
+    def _set_year(self, movie_id, year):
+        old = self._years[movie_id]
+        self._years[movie_id] = year
+        year = self._years[movie_id]
+        genre_index = self._genre_index[self._genres[movie_id]]
+        self._year_index.remove(old, movie_id)
+        genre_index.remove(old, movie_id)
+        self._year_index.add(year, movie_id)
+        genre_index.add(year, movie_id)
+
+    def _set_genre(self, movie_id, genre):
+        year = self._years[movie_id]
+        old = self._genres[movie_id]
+        genre_id = self._genre_id(genre)
+        self._genres[movie_id] = genre_id
+        self._genre_index[old].remove(year, movie_id)
+        self._genre_index[genre_id].add(year, movie_id)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __getitem__(self, movie_id):
+        if not 0 <= movie_id < len(self._titles):
+            raise IndexError("movie id out of range")
+        return MovieRecord(self, movie_id)
+
+    def _index(self, genre):
+        if genre is None:
+            return self._year_index
+        genre_id = self._genre_ids.get(genre)
+        return None if genre_id is None else self._genre_index[genre_id]
+
+    # Movie ids with the genre (any if None) and first <= year <= last, ordered by year
+    def query_ids(self, genre=None, first=None, last=None):
+        index = self._index(genre)
+        return array("I") if index is None else index.ids(first, last)
+
+    def query(self, genre=None, first=None, last=None):
+        return [MovieRecord(self, movie_id) for movie_id in self.query_ids(genre, first, last)]
+
+    def count(self, genre=None, first=None, last=None):
+        index = self._index(genre)
+        return 0 if index is None else index.count(first, last)
+
+
+GENRES = ["Adventure", "Drama", "Comedy", "Horror", "Animation", "Thriller", "Documentary", "Romance"]
+
+
+def random_rows(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"Movie {i}", rng.randint(1920, 2025), rng.choice(GENRES)
+
+
+def benchmark(count=2_000_000, queries=200):
+    rows = list(random_rows(count))
+    movies = [Movie(*row) for row in rows]
+
+    start = time.perf_counter()
+    catalog = MovieCatalog.from_rows(rows)
+    built = time.perf_counter() - start
+
+    rng = random.Random(1)
+    asks = []
+    for _ in range(queries):
+        first = rng.randint(1920, 2020)
+        asks.append((rng.choice(GENRES), first, first + 5))
+
+    start = time.perf_counter()
+    found = [len(catalog.query_ids(genre, first, last)) for genre, first, last in asks]
+    indexed = (time.perf_counter() - start) / queries
+
+    scan_asks = asks[:5]
+    start = time.perf_counter()
+    scanned = [sum(1 for m in movies if m.get_genre() == genre and first <= m.get_year() <= last)
+               for genre, first, last in scan_asks]
+    scan = (time.perf_counter() - start) / len(scan_asks)
+    assert scanned == found[:len(scan_asks)]
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        record = catalog[rng.randrange(count)]
+        record.set_year(rng.randint(1920, 2025))
+        record.set_genre(rng.choice(GENRES))
+    mutate = (time.perf_counter() - start) / 1000
+
+    print(f"{count} movies, catalog built in {built:.2f} s")
+    print(f"genre + 6 year range, scan of Movie objects: {scan * 1000:9.2f} ms/query")
+    print(f"genre + 6 year range, MovieCatalog         : {indexed * 1000:9.2f} ms/query "
+          f"({sum(found) // queries} matches avg)")
+    print(f"set_year + set_genre with index upkeep     : {mutate * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    catalog = MovieCatalog()
+    catalog.add_movie(Movie("The Lion King", 1994, "Adventure"))
+    catalog.add("Forrest Gump", 1994, "Drama")
+    catalog.add("Toy Story", 1995, "Animation")
+    catalog.add("Jurassic Park", 1993, "Adventure")
+
+    print(catalog.query("Adventure", 1990, 1994))
+    movie = catalog[2]
+    movie.print_details()
+    movie.set_genre("Adventure")
+    movie.set_year(1994)
+    print(catalog.query("Adventure", 1994, 1994), catalog.count("Animation"))
+
+    benchmark()
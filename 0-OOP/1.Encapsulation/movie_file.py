@@ -0,0 +1,227 @@
+'''
+Memory-mapped binary file format for Movie records.
+
+Layout (little endian):
+
+    header      64 bytes   magic b"MOVF", version, record count, genre count,
+                           offset of the genre table, offset of the string heap
+    records     16 bytes per movie, at offset 64
+                    title offset in the heap (8), title length (4), year (2), genre id (2)
+    genres      16 bytes per genre: offset in the heap (8), length (4), padding (4)
+    heap        UTF-8 bytes of every title and genre
+
+All records have the same size, so movie i is at 64 + 16 * i and needs no parsing of the ones
+before it. MovieFile.open() maps the file and reads only the header and the (short) genre table,
+so it takes the same few milliseconds for a thousand or fifty million movies. The pages of the
+records and of the heap are loaded by the OS when they are first touched.
+
+movie_file[i] is a MappedMovie, a Movie whose get_title / get_year / get_genre read the mapping
+directly; title_bytes() returns a memoryview into the mapping without copying. The file is read
+only, the set_* methods raise.
+
+write_movies() streams: records go to the file as the movies arrive, titles go to a temporary
+heap file that is appended at the end, and the header is written last.
+'''
+import json
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import time
+
+from encapsulation import Movie
+from frozen_movie import FrozenMovie
+from movie_catalog import random_rows
+
+
+MAGIC = b"MOVF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQIQQ")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<QIhH")
+GENRE = struct.Struct("<QI4x")
+
+
+class MovieFileError(ValueError):
+    pass
+
+
+def write_movies(path, movies):
+    genre_ids = {}
+    genres = []
+    count = 0
+    heap_size = 0
+    with open(path, "wb") as file, tempfile.TemporaryFile() as heap:
+        file.write(bytes(HEADER_SIZE))
+        pack = RECORD.pack
+        for movie in movies:
+            title = movie.get_title().encode()
+            genre = movie.get_genre()
+            genre_id = genre_ids.get(genre)
+            if genre_id is None:
+                genre_id = genre_ids[genre] = len(genres)
+                genres.append(genre)
+            file.write(pack(heap_size, len(title), movie.get_year(), genre_id))
+            heap.write(title)
+            heap_size += len(title)
+            count += 1
+
+        genres_offset = file.tell()
+        genre_bytes = [genre.encode() for genre in genres]
+        for data in genre_bytes:
+            file.write(GENRE.pack(heap_size, len(data)))
+            heap_size += len(data)
+        heap_offset = file.tell()
+        heap.seek(0)
+        shutil.copyfileobj(heap, file, 1 << 20)
+        for data in genre_bytes:
+            file.write(data)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, 0, count, len(genres), genres_offset, heap_offset))
+    return count
+
+
+class MappedMovie(Movie):
+    # View of record `index` in a MovieFile; Movie.__init__ is not called
+    def __init__(self, movie_file, index):
+        self._file = movie_file
+        self._offset = HEADER_SIZE + RECORD.size * index
+
+    def _record(self):
+        return RECORD.unpack_from(self._file._map, self._offset)
+
+    # zero copy: a memoryview on the title bytes inside the mapping, release it before close()
+    def title_bytes(self):
+        start, length, _, _ = self._record()
+        start += self._file.heap_offset
+        return self._file._view[start:start + length]
+
+    def get_title(self):
+        start, length, _, _ = self._record()
+        start += self._file.heap_offset
+        return str(self._file._map[start:start + length], "utf-8")
+
+    def get_year(self):
+        return self._record()[2]
+
+    def get_genre(self):
+        return self._file.genres[self._record()[3]]
+
+    def _read_only(self, value):
+        raise TypeError("MovieFile records are read only")
+
+    set_title = set_year = set_genre = _read_only
+
+    def __repr__(self):
+        return f"MappedMovie({self.get_title()!r}, {self.get_year()}, {self.get_genre()!r})"
+
+
+class MovieFile:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER_SIZE:
+            self._map.close()
+            raise MovieFileError(f"{path} is too short to be a movie file")
+        magic, version, _, count, genre_count, genres_offset, heap_offset = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise MovieFileError(f"{path} is not a version {VERSION} movie file")
+        self._view = memoryview(self._map)
+        self.count = count
+        self.heap_offset = heap_offset
+        # the genre table is tiny, decode it once
+        self.genres = []
+        for i in range(genre_count):
+            start, length = GENRE.unpack_from(self._map, genres_offset + GENRE.size * i)
+            start += heap_offset
+            self.genres.append(str(self._map[start:start + length], "utf-8"))
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("movie index out of range")
+        return MappedMovie(self, index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield MappedMovie(self, index)
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(count=2_000_000):
+    directory = tempfile.mkdtemp()
+    try:
+        paths = {name: os.path.join(directory, "movies." + name) for name in ("bin", "pkl", "json")}
+        rows = list(random_rows(count))
+        write_movies(paths["bin"], (FrozenMovie(*row) for row in rows))
+        with open(paths["pkl"], "wb") as file:
+            pickle.dump([Movie(*row) for row in rows], file, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(paths["json"], "w") as file:
+            json.dump(rows, file)
+        del rows
+
+        def open_binary():
+            return MovieFile.open(paths["bin"])
+
+        def open_pickle():
+            with open(paths["pkl"], "rb") as file:
+                return pickle.load(file)
+
+        def open_json():
+            with open(paths["json"]) as file:
+                return [Movie(*row) for row in json.load(file)]
+
+        print(f"{count} movies, time to open and read the title of the last one")
+        for name, kind, opener in (("MovieFile (mmap)", "bin", open_binary),
+                                   ("pickle", "pkl", open_pickle), ("json", "json", open_json)):
+            start = time.perf_counter()
+            movies = opener()
+            title = movies[count - 1].get_title()
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(paths[kind])
+            print(f"{name:17}: {elapsed * 1000:9.2f} ms, {size / 1e6:6.1f} MB on disk, last={title!r}")
+            if isinstance(movies, MovieFile):
+                movies.close()
+            del movies
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    movies = [Movie("The Lion King", 1994, "Adventure"), Movie("Forrest Gump", 1994, "Drama"),
+              Movie("Toy Story", 1995, "Animation")]
+    path = os.path.join(tempfile.mkdtemp(), "movies.bin")
+    write_movies(path, movies)
+    with MovieFile.open(path) as catalog:
+        for movie in catalog:
+            movie.print_details()
+        print(bytes(catalog[2].title_bytes()), len(catalog))
+        try:
+            catalog[0].set_title("Jurassic Park")
+        except TypeError as error:
+            print("read only:", error)
+    shutil.rmtree(os.path.dirname(path))
+
+    benchmark()
@@ -1,8 +1,10 @@
 class Circle:
+    # pi is a constant, one class attribute is shared by every circle
+    pi = 3.142
+
     #define data attributes within the constructor
     def __init__(self, r=0):
         self.radius = r
-        self.pi = 3.142
 
     #define methods
     def area(self):
@@ -0,0 +1,158 @@
+'''
+CircleArray: the Circle interface of abstraction.py over a whole NumPy buffer of radii.
+
+    circles = CircleArray(radii)            radii: list, ndarray or np.memmap
+    circles.area()                          one array of areas, no Python loop
+    circles.perimeter(out=buffer)           written into a preallocated buffer, no allocation
+
+pi defaults to Circle.pi (3.142), so the results are bit for bit the ones Circle gives; pass
+pi=math.pi for the exact constant. The formulas are evaluated in the same order as Circle does
+(pi * r * r, and (2 * pi) * r), which is what keeps them identical.
+
+For arrays bigger than RAM keep the radii in a file (CircleArray.from_file) and give a chunk
+size: the area is computed chunk by chunk straight into `out` (which can itself be an
+np.memmap), or reduced without any output array with total_area().
+'''
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from abstraction import Circle
+
+
+LEGACY_PI = Circle.pi
+
+
+class CircleArray:
+    def __init__(self, radius, pi=LEGACY_PI):
+        # np.asarray keeps an np.memmap (or any float64 array) as it is, without a copy
+        self.radius = np.asarray(radius, dtype=np.float64)
+        self.pi = pi
+
+    @classmethod
+    def from_file(cls, path, pi=LEGACY_PI):
+        return cls(np.memmap(path, dtype=np.float64, mode="r"), pi)
+
+    def __len__(self):
+        return len(self.radius)
+
+    def _out(self, out):
+        if out is None:
+            return np.empty_like(self.radius, dtype=np.float64)
+        if out.shape != self.radius.shape:
+            raise ValueError(f"out has shape {out.shape}, expected {self.radius.shape}")
+        return out
+
+    def _chunks(self, chunk_size):
+        length = len(self.radius)
+        if chunk_size is None:
+            yield 0, length
+            return
+        for start in range(0, length, chunk_size):
+            yield start, min(start + chunk_size, length)
+
+    def area(self, out=None, chunk_size=None):
+        out = self._out(out)
+        for start, stop in self._chunks(chunk_size):
+            r = self.radius[start:stop]
+            part = out[start:stop]
+            np.multiply(self.pi, r, out=part)
+            np.multiply(part, r, out=part)
+        return out
+
+    def perimeter(self, out=None, chunk_size=None):
+        out = self._out(out)
+        two_pi = 2 * self.pi
+        for start, stop in self._chunks(chunk_size):
+            np.multiply(two_pi, self.radius[start:stop], out=out[start:stop])
+        return out
+
+    # Sum of all areas with one chunk-sized scratch buffer, for radii that do not fit in RAM
+    def total_area(self, chunk_size=1 << 20):
+        scratch = np.empty(min(chunk_size, len(self.radius)), dtype=np.float64)
+        total = 0.0
+        for start, stop in self._chunks(chunk_size):
+            r = self.radius[start:stop]
+            part = scratch[:stop - start]
+            np.multiply(self.pi, r, out=part)
+            np.multiply(part, r, out=part)
+            total += float(part.sum())
+        return total
+
+    def __getitem__(self, index):
+        circle = Circle(float(self.radius[index]))
+        # only shadow the class attribute when it differs, so default circles stay plain
+        if self.pi != Circle.pi:
+            circle.pi = self.pi
+        return circle
+
+
+def benchmark(count=10_000_000, file_count=50_000_000, chunk_size=1 << 22):
+    rng = np.random.default_rng(0)
+    radii = rng.uniform(0, 100, count)
+
+    sample = 1_000_000
+    start = time.perf_counter()
+    expected = [Circle(r).area() for r in radii[:sample].tolist()]
+    per_object = (time.perf_counter() - start) * count / sample
+
+    circles = CircleArray(radii)
+    start = time.perf_counter()
+    areas = circles.area()
+    vectorized = time.perf_counter() - start
+    assert areas[:sample].tolist() == expected
+
+    buffer = np.empty(count)
+    start = time.perf_counter()
+    circles.area(out=buffer)
+    in_place = time.perf_counter() - start
+
+    print(f"{count} radii")
+    print(f"Circle(r).area() per object (extrapolated): {per_object * 1000:9.1f} ms")
+    print(f"CircleArray.area()                        : {vectorized * 1000:9.1f} ms")
+    print(f"CircleArray.area(out=buffer)              : {in_place * 1000:9.1f} ms")
+
+    # radii file on disk, processed chunk by chunk into another file
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "radii.f64")
+    target = os.path.join(directory, "areas.f64")
+    try:
+        writer = np.memmap(source, dtype=np.float64, mode="w+", shape=(file_count,))
+        for begin in range(0, file_count, chunk_size):
+            end = min(begin + chunk_size, file_count)
+            writer[begin:end] = rng.uniform(0, 100, end - begin)
+        writer.flush()
+        del writer
+
+        on_disk = CircleArray.from_file(source)
+        out = np.memmap(target, dtype=np.float64, mode="w+", shape=(file_count,))
+        start = time.perf_counter()
+        on_disk.area(out=out, chunk_size=chunk_size)
+        out.flush()
+        chunked = time.perf_counter() - start
+        start = time.perf_counter()
+        total = on_disk.total_area(chunk_size)
+        reduced = time.perf_counter() - start
+        print(f"{file_count} radii from a {file_count * 8 / 1e6:.0f} MB np.memmap, "
+              f"chunks of {chunk_size}")
+        print(f"area(out=memmap), chunked                 : {chunked * 1000:9.1f} ms")
+        print(f"total_area(), chunked                     : {reduced * 1000:9.1f} ms, total {total:.4g}")
+        del out, on_disk
+    finally:
+        for path in (source, target):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    circles = CircleArray([1, 5, 10])
+    print("Area:", circles.area())
+    print("Perimeter:", circles.perimeter())
+    print("Area with math.pi:", CircleArray([1, 5, 10], pi=math.pi).area())
+    print("same as Circle(5):", circles.area()[1] == Circle(5).area())
+
+    benchmark()
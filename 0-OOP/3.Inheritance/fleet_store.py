@@ -0,0 +1,264 @@
+'''
+Compact, column based store for very large fleets of the vehicles in inheritance.py.
+
+A plain FuelCar / HybridCar instance carries its own __dict__ and its own string objects,
+which is several hundred bytes per vehicle. FleetStore keeps one row per vehicle in typed
+arrays instead:
+
+    kind                                         1 byte   (which class the vehicle is)
+    name, model, combust_type, battery_power,    4 bytes each, an index into a string pool
+    gas_capacity
+
+Every distinct value ("Toyota", "Petrol", 200, ...) is stored once in the pool, so a vehicle costs
+21 bytes however long its strings are.
+
+store[i] builds a view object on demand. The views are real subclasses of Vehicle, FuelCar,
+ElectricCar, GasolineCar and HybridCar whose fields read from (and write to) the columns, so
+isinstance checks and the inherited get_* methods work on them unchanged.
+'''
+import gc
+import sys
+import time
+import tracemalloc
+from array import array
+
+from inheritance import ElectricCar, FuelCar, GasolineCar, HybridCar, Vehicle
+
+
+FIELDS = ("name", "model", "combust_type", "battery_power", "gas_capacity")
+
+
+# Stores each distinct value once; values keep their type, so 200 and "200" stay apart
+class StringPool:
+    def __init__(self):
+        # id 0 is reserved for "field not set"
+        self._strings = [None]
+        self._ids = {}
+
+    def intern(self, value):
+        if value is None:
+            return 0
+        if type(value) is str:
+            value = sys.intern(value)
+        # keyed by type too, otherwise 1, 1.0 and True would share an id
+        key = (type(value), value)
+        string_id = self._ids.get(key)
+        if string_id is None:
+            string_id = self._ids[key] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def lookup(self, string_id):
+        return self._strings[string_id]
+
+    def find(self, value):
+        return self._ids.get((type(value), value))
+
+    def __len__(self):
+        return len(self._strings) - 1
+
+
+def _column_property(field):
+    def getter(self):
+        return self._store.get_field(self._index, field)
+
+    def setter(self, value):
+        self._store.set_field(self._index, field, value)
+
+    return property(getter, setter)
+
+
+class _ColumnView:
+    # Fields come from the store columns instead of the instance __dict__
+    name = _column_property("name")
+    model = _column_property("model")
+    combust_type = _column_property("combust_type")
+    battery_power = _column_property("battery_power")
+    gas_capacity = _column_property("gas_capacity")
+
+    def __repr__(self):
+        return f"<{type(self).__name__} #{self._index} {self.name} {self.model}>"
+
+
+class VehicleView(_ColumnView, Vehicle):
+    pass
+
+
+class FuelCarView(_ColumnView, FuelCar):
+    pass
+
+
+class ElectricCarView(_ColumnView, ElectricCar):
+    pass
+
+
+class GasolineCarView(_ColumnView, GasolineCar):
+    pass
+
+
+class HybridCarView(_ColumnView, HybridCar):
+    pass
+
+
+# kind code -> (original class, view class); subclasses first so lookups pick the most specific
+KINDS = [
+    (HybridCar, HybridCarView),
+    (GasolineCar, GasolineCarView),
+    (ElectricCar, ElectricCarView),
+    (FuelCar, FuelCarView),
+    (Vehicle, VehicleView),
+]
+KIND_OF = {cls: code for code, (cls, _) in enumerate(KINDS)}
+
+
+# Kind code of the closest known class in the MRO, so subclasses and views work too
+def kind_of(cls):
+    for base in cls.__mro__:
+        code = KIND_OF.get(base)
+        if code is not None:
+            return code
+    raise TypeError(f"{cls.__name__} is not a Vehicle")
+
+
+class FleetStore:
+    def __init__(self):
+        self.strings = StringPool()
+        self.kind = array("B")
+        self.columns = {field: array("I") for field in FIELDS}
+
+    def append(self, cls, name, model, combust_type=None, battery_power=None, gas_capacity=None):
+        self.kind.append(kind_of(cls))
+        intern = self.strings.intern
+        values = (name, model, combust_type, battery_power, gas_capacity)
+        for field, value in zip(FIELDS, values):
+            self.columns[field].append(intern(value))
+        return len(self.kind) - 1
+
+    def add(self, vehicle):
+        return self.append(type(vehicle), *(getattr(vehicle, field, None) for field in FIELDS))
+
+    @classmethod
+    def from_vehicles(cls, vehicles):
+        store = cls()
+        for vehicle in vehicles:
+            store.add(vehicle)
+        return store
+
+    def get_field(self, index, field):
+        return self.strings.lookup(self.columns[field][index])
+
+    def set_field(self, index, field, value):
+        self.columns[field][index] = self.strings.intern(value)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("vehicle index out of range")
+        view = object.__new__(KINDS[self.kind[index]][1])
+        view._store = self
+        view._index = index
+        return view
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    # Row indices whose field equals value, compares pool ids without building views
+    def where(self, field, value):
+        string_id = self.strings.find(value)
+        if string_id is None:
+            return []
+        column = self.columns[field]
+        return [index for index, current in enumerate(column) if current == string_id]
+
+    def count_by_kind(self):
+        counts = [0] * len(KINDS)
+        for code in self.kind:
+            counts[code] += 1
+        return {KINDS[code][0].__name__: count for code, count in enumerate(counts) if count}
+
+    def nbytes(self):
+        return (self.kind.itemsize * len(self.kind)
+                + sum(column.itemsize * len(column) for column in self.columns.values()))
+
+
+def random_fleet_rows(count):
+    makes = [("Honda", "Accord"), ("Tesla", "ModelX"), ("Toyota", "Corolla"), ("Toyota", "Prius")]
+    for i in range(count):
+        name, model = makes[i % len(makes)]
+        # build new string objects, like rows parsed from a file would be
+        name, model = "".join(name), "".join(model)
+        kind = i % 4
+        if kind == 0:
+            yield FuelCar, (name, model, "Petrol")
+        elif kind == 1:
+            yield ElectricCar, (name, model, f"{200 + i % 5}MWH")
+        elif kind == 2:
+            yield GasolineCar, (name, model, "Gasoline", f"{30 + i % 10} liters")
+        else:
+            yield HybridCar, (name, model, "Hybrid", f"{100 + i % 5}MWH")
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def benchmark(count=200_000):
+    def build_objects():
+        return [cls(*args) for cls, args in random_fleet_rows(count)]
+
+    def build_store():
+        store = FleetStore()
+        for cls, args in random_fleet_rows(count):
+            if cls is GasolineCar:
+                store.append(cls, *args[:3], gas_capacity=args[3])
+            elif cls is ElectricCar:
+                store.append(cls, *args[:2], battery_power=args[2])
+            elif cls is HybridCar:
+                store.append(cls, *args[:3], battery_power=args[3])
+            else:
+                store.append(cls, *args)
+        return store
+
+    objects, object_bytes, object_time = _measure(build_objects)
+    del objects
+    store, store_bytes, store_time = _measure(build_store)
+
+    print(f"{count} vehicles")
+    print(f"plain instances: {object_bytes / count:6.1f} bytes/vehicle, "
+          f"built {count / object_time / 1e6:5.2f} M/s")
+    print(f"FleetStore     : {store_bytes / count:6.1f} bytes/vehicle, "
+          f"built {count / store_time / 1e6:5.2f} M/s, {len(store.strings)} distinct strings")
+
+    start = time.perf_counter()
+    toyotas = len(store.where("name", "Toyota"))
+    print(f"where(name='Toyota'): {toyotas} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    store = FleetStore()
+    store.append(FuelCar, "Honda", "Accord", "Petrol")
+    store.append(ElectricCar, "Tesla", "ModelX", battery_power="200MWH")
+    store.append(GasolineCar, "Toyota", "Corolla", "Gasoline", gas_capacity="30 liters")
+    store.add(HybridCar("Toyota", "Prius", "Hybrid", "100MWH"))
+
+    store[0].get_fuel_car()
+    print()
+    store[1].get_electric_car()
+    print()
+    store[2].get_gasoline_car()
+    store[3].get_hybrid()
+    print(isinstance(store[3], HybridCar), store.count_by_kind())
+
+    benchmark()
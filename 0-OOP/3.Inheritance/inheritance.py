@@ -1,10 +1,20 @@
 # Base class (Parent)
+# Every __init__ calls its base by name, which is the cheapest call there is. Only the HybridCar
+# diamond needs care, see HybridCar.__init__.
 class Vehicle():
     def __init__(self, name, model):
         self.name = name
         self.model = model
 
-    def get_name(self):
+    # Structured form of what get_name prints
+    def name_record(self):
+        return {"name": self.name, "model": self.model}
+
+    # With a sink the record is handed to sink.write() instead of printed (see output_sink.py)
+    def get_name(self, sink=None):
+        if sink is not None:
+            sink.write(self.name_record())
+            return
         print("The car is a", self.name, self.model, end="")
 
 # Single inheritance
@@ -13,9 +23,17 @@ class Vehicle():
 class FuelCar(Vehicle):
     def __init__(self, name, model, combust_type):
         self.combust_type = combust_type
-        Vehicle.__init__( self,name, model)
+        Vehicle.__init__(self, name, model)
 
-    def get_fuel_car(self):
+    def fuel_car_record(self):
+        record = self.name_record()
+        record["combust_type"] = self.combust_type
+        return record
+
+    def get_fuel_car(self, sink=None):
+        if sink is not None:
+            sink.write(self.fuel_car_record())
+            return
         super().get_name()
         print(", combust type is", self.combust_type, end="")
 
@@ -27,7 +45,15 @@ class ElectricCar(Vehicle):
         self.battery_power = battery_power
         Vehicle.__init__(self, name, model)
 
-    def get_electric_car(self):
+    def electric_car_record(self):
+        record = self.name_record()
+        record["battery_power"] = self.battery_power
+        return record
+
+    def get_electric_car(self, sink=None):
+        if sink is not None:
+            sink.write(self.electric_car_record())
+            return
         super().get_name()
         print(", battery power is", self.battery_power, end="")
 
@@ -36,10 +62,18 @@ class ElectricCar(Vehicle):
 # Derived class (Grandchild)
 class GasolineCar(FuelCar):
     def __init__(self, name, model, combust_type, gas_capacity):
-            self.gas_capacity = gas_capacity
-            FuelCar.__init__(self, name, model, combust_type)
+        self.gas_capacity = gas_capacity
+        FuelCar.__init__(self, name, model, combust_type)
     
-    def get_gasoline_car(self):
+    def gasoline_car_record(self):
+        record = self.fuel_car_record()
+        record["gas_capacity"] = self.gas_capacity
+        return record
+
+    def get_gasoline_car(self, sink=None):
+        if sink is not None:
+            sink.write(self.gasoline_car_record())
+            return
         super().get_fuel_car()
         print(", gas capacity is",self.gas_capacity)
 
@@ -48,12 +82,21 @@ class GasolineCar(FuelCar):
 # Derived class
 class HybridCar(GasolineCar, ElectricCar):
 
-    def __init__(self, name, model, combust_type, battery_power):
-        FuelCar.__init__(self, name, model, combust_type)
-        ElectricCar.__init__(self,name, model, battery_power)
+    # GasolineCar -> FuelCar -> Vehicle run once each. ElectricCar.__init__ would only set
+    # battery_power and then run Vehicle.__init__ a second time, so its field is set here instead
+    def __init__(self, name, model, combust_type, battery_power, gas_capacity=None):
         self.battery_power = battery_power
+        GasolineCar.__init__(self, name, model, combust_type, gas_capacity)
+
+    def hybrid_record(self):
+        record = self.fuel_car_record()
+        record["battery_power"] = self.battery_power
+        return record
 
-    def get_hybrid(self):
+    def get_hybrid(self, sink=None):
+        if sink is not None:
+            sink.write(self.hybrid_record())
+            return
         self.get_fuel_car()
         print(", battery power is",self.battery_power)
      
@@ -77,4 +120,5 @@ def main():
     print("Multiple inheritance:")
     Hybrid = HybridCar("Toyota", "Prius", "Hybrid", "100MWH")
     Hybrid.get_hybrid()
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+'''
+Output sinks for the vehicle getters of inheritance.py.
+
+Called without arguments, get_fuel_car(), get_hybrid(), ... print their description piece by
+piece. Called with a sink, they build one record instead
+
+    {"name": "Toyota", "model": "Prius", "combust_type": "Hybrid", "battery_power": "100MWH"}
+
+and hand it to sink.write(record). Three sinks are provided:
+
+    ListSink          keeps the records in memory
+    JsonLinesSink     one JSON object per line in a file; lines are collected until
+                      `buffer_size` bytes are pending and then written with a single write(),
+                      so a million descriptions take a few dozen writes
+    NullSink          drops the records, for benchmarks
+'''
+import json
+import os
+import sys
+import tempfile
+import time
+
+from inheritance import ElectricCar, FuelCar, GasolineCar, HybridCar, Vehicle
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+
+class NullSink:
+    def __init__(self):
+        self.count = 0
+
+    def write(self, record):
+        self.count += 1
+
+
+class JsonLinesSink:
+    def __init__(self, path, buffer_size=1 << 20):
+        # unbuffered file, this class does the buffering so every write() is one system call
+        self._file = open(path, "wb", buffering=0)
+        self.buffer_size = buffer_size
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._pending = []
+        self._pending_bytes = 0
+        self.writes = 0
+        self.count = 0
+
+    def write(self, record):
+        line = (self._encode(record) + "\n").encode()
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        self.count += 1
+        if self._pending_bytes >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            # a raw write may take only part of the buffer, keep going until all of it is out
+            data = memoryview(b"".join(self._pending))
+            while data:
+                written = self._file.write(data)
+                self.writes += 1
+                data = data[written:]
+            self._pending = []
+            self._pending_bytes = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Most specific getter first, HybridCar is also a GasolineCar and an ElectricCar
+GETTERS = [
+    (HybridCar, "get_hybrid"),
+    (GasolineCar, "get_gasoline_car"),
+    (ElectricCar, "get_electric_car"),
+    (FuelCar, "get_fuel_car"),
+    (Vehicle, "get_name"),
+]
+
+
+def describe(vehicle, sink=None):
+    for cls, getter in GETTERS:
+        if isinstance(vehicle, cls):
+            return getattr(vehicle, getter)(sink)
+    raise TypeError(f"not a Vehicle: {vehicle!r}")
+
+
+def describe_fleet(vehicles, sink):
+    for vehicle in vehicles:
+        describe(vehicle, sink)
+
+
+def sample_fleet(count):
+    kinds = [
+        lambda i: FuelCar("Honda", "Accord", "Petrol"),
+        lambda i: ElectricCar("Tesla", "ModelX", f"{200 + i % 5}MWH"),
+        lambda i: GasolineCar("Toyota", "Corolla", "Gasoline", f"{30 + i % 10} liters"),
+        lambda i: HybridCar("Toyota", "Prius", "Hybrid", f"{100 + i % 5}MWH"),
+    ]
+    return [kinds[i % 4](i) for i in range(count)]
+
+
+# Stands in for a line buffered terminal: counts the write calls print makes
+class _CountingStdout:
+    def __init__(self):
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+
+    def flush(self):
+        pass
+
+
+def benchmark(count=1_000_000):
+    fleet = sample_fleet(count)
+
+    stdout = sys.stdout
+    counting = sys.stdout = _CountingStdout()
+    start = time.perf_counter()
+    try:
+        for vehicle in fleet:
+            describe(vehicle)
+            print()
+    finally:
+        sys.stdout = stdout
+    printed = time.perf_counter() - start
+
+    null = NullSink()
+    start = time.perf_counter()
+    describe_fleet(fleet, null)
+    nulled = time.perf_counter() - start
+
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        with JsonLinesSink(path) as sink:
+            describe_fleet(fleet, sink)
+        dumped = time.perf_counter() - start
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+    print(f"{count} vehicle descriptions")
+    print(f"print          : {printed:5.2f} s, {counting.writes} write calls")
+    print(f"NullSink       : {nulled:5.2f} s")
+    print(f"JsonLinesSink  : {dumped:5.2f} s, {sink.writes} write calls, {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    fleet = sample_fleet(4)
+    sink = ListSink()
+    describe_fleet(fleet, sink)
+    for record in sink.records:
+        print(record)
+
+    # the default path still prints
+    describe(fleet[3])
+
+    benchmark()
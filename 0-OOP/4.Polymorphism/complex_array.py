@@ -0,0 +1,162 @@
+'''
+ComplexArray: many ComplexNumber values in one NumPy complex128 buffer.
+
+c1 + c2 on ComplexNumber builds a new object for every addition, so summing a million numbers
+with + leaves a million temporaries behind. There are three ways to add them up:
+
+    object per op     total = total + c          one new ComplexNumber per addition
+    in place          total += c                 __iadd__ updates one accumulator
+    vectorized        ComplexArray(...).sum()    one pass in C over the complex128 buffer
+
+ComplexArray supports +, -, * with another ComplexArray, a ComplexNumber or a plain number,
+the in-place versions (+=, -=, *=) that write into the existing buffer, and sum(), which
+returns a ComplexNumber.
+'''
+import random
+import time
+
+import numpy as np
+
+from polymorphism import ComplexNumber
+
+
+def _operand(other):
+    if isinstance(other, ComplexArray):
+        return other.values
+    if isinstance(other, ComplexNumber):
+        return complex(other.real, other.imaginary)
+    if isinstance(other, (int, float, complex)):
+        return other
+    return None
+
+
+class ComplexArray:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.complex128)
+
+    @classmethod
+    def from_numbers(cls, numbers):
+        values = np.fromiter((complex(c.real, c.imaginary) for c in numbers), dtype=np.complex128)
+        return cls(values)
+
+    @classmethod
+    def from_parts(cls, real, imaginary):
+        values = np.empty(len(real), dtype=np.complex128)
+        values.real = real
+        values.imag = imaginary
+        return cls(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        value = self.values[index]
+        return ComplexNumber.of(float(value.real), float(value.imag))
+
+    def to_numbers(self):
+        return [ComplexNumber.of(value.real, value.imag) for value in self.values.tolist()]
+
+    def _binary(self, other, kernel):
+        operand = _operand(other)
+        if operand is None:
+            return NotImplemented
+        return ComplexArray(kernel(self.values, operand))
+
+    def _inplace(self, other, kernel):
+        operand = _operand(other)
+        if operand is None:
+            return NotImplemented
+        kernel(self.values, operand, out=self.values)
+        return self
+
+    def __add__(self, other):
+        return self._binary(other, np.add)
+
+    def __radd__(self, other):
+        return self._binary(other, np.add)
+
+    def __iadd__(self, other):
+        return self._inplace(other, np.add)
+
+    def __sub__(self, other):
+        return self._binary(other, np.subtract)
+
+    def __rsub__(self, other):
+        operand = _operand(other)
+        if operand is None:
+            return NotImplemented
+        return ComplexArray(np.subtract(operand, self.values))
+
+    def __isub__(self, other):
+        return self._inplace(other, np.subtract)
+
+    def __mul__(self, other):
+        return self._binary(other, np.multiply)
+
+    def __rmul__(self, other):
+        return self._binary(other, np.multiply)
+
+    def __imul__(self, other):
+        return self._inplace(other, np.multiply)
+
+    def sum(self):
+        total = self.values.sum()
+        return ComplexNumber.of(float(total.real), float(total.imag))
+
+    def display(self):
+        for c in self.to_numbers():
+            c.display()
+
+
+def random_numbers(count, seed=0):
+    rng = random.Random(seed)
+    return [ComplexNumber.of(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(count)]
+
+
+def benchmark(count=1_000_000):
+    numbers = random_numbers(count)
+
+    start = time.perf_counter()
+    total = ComplexNumber()
+    for c in numbers:
+        total = total + c
+    per_op = time.perf_counter() - start
+
+    start = time.perf_counter()
+    in_place = ComplexNumber()
+    for c in numbers:
+        in_place += c
+    iadd = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summed = sum(numbers)
+    builtin = time.perf_counter() - start
+
+    start = time.perf_counter()
+    array = ComplexArray.from_numbers(numbers)
+    convert = time.perf_counter() - start
+    start = time.perf_counter()
+    vectorized = array.sum()
+    reduce = time.perf_counter() - start
+
+    for result in (in_place, summed, vectorized):
+        assert abs(result.real - total.real) < 1e-6 and abs(result.imaginary - total.imaginary) < 1e-6
+
+    print(f"sum of {count} complex numbers")
+    print(f"total = total + c (object per op): {per_op * 1000:8.1f} ms")
+    print(f"total += c        (in place)     : {iadd * 1000:8.1f} ms")
+    print(f"sum(numbers)      (__radd__)     : {builtin * 1000:8.1f} ms")
+    print(f"ComplexArray.sum()               : {reduce * 1000:8.1f} ms "
+          f"(+ {convert * 1000:.1f} ms to build the array from objects)")
+
+
+if __name__ == "__main__":
+    a = ComplexArray([11 + 5j, 2 + 6j])
+    b = ComplexArray.from_numbers([ComplexNumber.of(1, 1), ComplexNumber.of(0, 2)])
+    (a + b).display()
+    (a * ComplexNumber.of(0, 1)).display()
+    a += 1
+    a.display()
+    a.sum().display()
+
+    benchmark()
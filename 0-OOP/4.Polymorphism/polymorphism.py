@@ -20,9 +20,10 @@ class Lion(Animal):
     print("I am from the Lion class")
 
 
-lion = Lion()
-lion.print_animal()
-lion.print_animal_two()
+if __name__ == "__main__":
+  lion = Lion()
+  lion.print_animal()
+  lion.print_animal_two()
 
 '''
 Method overloading
@@ -35,14 +36,17 @@ class Area:
             return length * length;
 
 
-area = Area()
-print("Area of rectangle = " + str(area.calculateArea(3, 4)))
-print("Area of square = " + str(area.calculateArea(6)))
+if __name__ == "__main__":
+    area = Area()
+    print("Area of rectangle = " + str(area.calculateArea(3, 4)))
+    print("Area of square = " + str(area.calculateArea(6)))
 
 '''
 Operator overloading
 '''
 class ComplexNumber: 
+    # no per-instance __dict__, every operator result is cheaper to create
+    __slots__ = ("real", "imaginary")
     # Constructor
     def __init__(self): 
         self.real = 0 
@@ -51,20 +55,117 @@ class ComplexNumber:
     def set_value(self, real, imaginary): 
         self.real = real
         self.imaginary = imaginary 
+    # Builds the result in one step, without set_value or the zeroing in __init__
+    @classmethod
+    def of(cls, real, imaginary):
+        result = object.__new__(cls)
+        result.real = real
+        result.imaginary = imaginary
+        return result
+    # (real, imaginary) of the other operand, plain numbers have no imaginary part
+    @staticmethod
+    def _parts(c):
+        if isinstance(c, ComplexNumber):
+            return c.real, c.imaginary
+        if isinstance(c, complex):
+            return c.real, c.imag
+        if isinstance(c, (int, float)):
+            return c, 0
+        return None
     # Overloading function for + operator
+    # ComplexNumber + ComplexNumber is the common case, it skips _parts and of()
     def __add__(self, c): 
-        result = ComplexNumber() 
-        result.real = self.real + c.real 
-        result.imaginary = self.imaginary + c.imaginary 
-        return result 
+        if type(c) is ComplexNumber:
+            result = object.__new__(ComplexNumber)
+            result.real = self.real + c.real
+            result.imaginary = self.imaginary + c.imaginary
+            return result
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        return ComplexNumber.of(self.real + parts[0], self.imaginary + parts[1])
+    # 0 + c, so that sum() works
+    def __radd__(self, c):
+        return self.__add__(c)
+    # c += other updates c itself, no new object per addition
+    def __iadd__(self, c):
+        if type(c) is ComplexNumber:
+            self.real += c.real
+            self.imaginary += c.imaginary
+            return self
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        self.real += parts[0]
+        self.imaginary += parts[1]
+        return self
+    # Overloading function for - operator
+    def __sub__(self, c):
+        if type(c) is ComplexNumber:
+            result = object.__new__(ComplexNumber)
+            result.real = self.real - c.real
+            result.imaginary = self.imaginary - c.imaginary
+            return result
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        return ComplexNumber.of(self.real - parts[0], self.imaginary - parts[1])
+    def __rsub__(self, c):
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        return ComplexNumber.of(parts[0] - self.real, parts[1] - self.imaginary)
+    def __isub__(self, c):
+        if type(c) is ComplexNumber:
+            self.real -= c.real
+            self.imaginary -= c.imaginary
+            return self
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        self.real -= parts[0]
+        self.imaginary -= parts[1]
+        return self
+    # Overloading function for * operator: (a + bi)(c + di) = (ac - bd) + (ad + bc)i
+    def __mul__(self, c):
+        if type(c) is ComplexNumber:
+            result = object.__new__(ComplexNumber)
+            result.real = self.real * c.real - self.imaginary * c.imaginary
+            result.imaginary = self.real * c.imaginary + self.imaginary * c.real
+            return result
+        parts = self._parts(c)
+        if parts is None:
+            return NotImplemented
+        real, imaginary = parts
+        return ComplexNumber.of(self.real * real - self.imaginary * imaginary,
+                                self.real * imaginary + self.imaginary * real)
+    def __rmul__(self, c):
+        return self.__mul__(c)
+    def __imul__(self, c):
+        if type(c) is ComplexNumber:
+            real, imaginary = c.real, c.imaginary
+        else:
+            parts = self._parts(c)
+            if parts is None:
+                return NotImplemented
+            real, imaginary = parts
+        self.real, self.imaginary = (self.real * real - self.imaginary * imaginary,
+                                     self.real * imaginary + self.imaginary * real)
+        return self
+    def __repr__(self):
+        return f"ComplexNumber.of({self.real!r}, {self.imaginary!r})"
     # display results
     def display(self): 
         print( "(", self.real, "+", self.imaginary, "i)") 
  
  
-c1 = ComplexNumber() 
-c1.set_value(11, 5) 
-c2 = ComplexNumber() 
-c2.set_value(2, 6) 
-c3 = c1 + c2
-c3.display() 
\ No newline at end of file
+if __name__ == "__main__":
+    c1 = ComplexNumber() 
+    c1.set_value(11, 5) 
+    c2 = ComplexNumber() 
+    c2.set_value(2, 6) 
+    c3 = c1 + c2
+    c3.display()
+    (c1 - c2).display()
+    (c1 * c2).display()
+    sum([c1, c2, c3]).display() 
\ No newline at end of file
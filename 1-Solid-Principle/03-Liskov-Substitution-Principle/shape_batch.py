@@ -0,0 +1,201 @@
+'''
+Columnar (struct-of-arrays) storage for large collections of shapes.
+
+get_total_area() in lsp_exmp.py calls shape.area() once per object. ShapeBatch keeps the same
+shapes as four NumPy columns
+
+    kind    uint8    RECTANGLE / SQUARE / CIRCLE
+    width   float64  0 for circles
+    height  float64  0 for circles
+    radius  float64  0 for rectangles and squares
+
+and computes every area in one pass with the same formulas as the classes:
+
+    Rectangle / Square   width * height
+    Circle               math.pi * radius ** 2
+
+Both formulas are evaluated for every row; the unused one multiplies zeros, and adding an exact
+0.0 does not change the other term, so the per-row results are bit-for-bit the same as area().
+Dimensions are stored as float64, so integer sides above 2**53 lose precision.
+'''
+import math
+import time
+from array import array
+
+import numpy as np
+
+
+RECTANGLE = 0
+SQUARE = 1
+CIRCLE = 2
+
+
+# Same hierarchy as the last example in lsp_exmp.py
+class Shape:
+    def area(self):
+        pass
+
+
+class Quadrilateral(Shape):
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def area(self):
+        return self.width * self.height
+
+
+class Rectangle(Quadrilateral):
+    pass
+
+
+class Square(Quadrilateral):
+    def __init__(self, length):
+        super().__init__(length, length)
+
+
+class Circle(Shape):
+    def __init__(self, radius):
+        self.radius = radius
+
+    def area(self):
+        return math.pi * self.radius ** 2
+
+
+def get_total_area(shapes):
+    total_area = 0
+    for shape in shapes:
+        total_area += shape.area()
+    return total_area
+
+
+# Works for the lsp_exmp.py and ocp_exmp.py classes alike: only attribute names are used
+def _kind_of(shape):
+    if hasattr(shape, "radius"):
+        return CIRCLE
+    if hasattr(shape, "side"):
+        return SQUARE
+    if type(shape).__name__ == "Square":
+        return SQUARE
+    return RECTANGLE
+
+
+class ShapeBatch:
+    # Rows processed per step in total_area(), bounds the size of the temporaries
+    CHUNK = 1 << 20
+
+    def __init__(self, kind, width, height, radius):
+        self.kind = np.asarray(kind, dtype=np.uint8)
+        self.width = np.asarray(width, dtype=np.float64)
+        self.height = np.asarray(height, dtype=np.float64)
+        self.radius = np.asarray(radius, dtype=np.float64)
+        if not (len(self.kind) == len(self.width) == len(self.height) == len(self.radius)):
+            raise ValueError("all columns must have the same length")
+
+    @classmethod
+    def from_shapes(cls, shapes):
+        kind = array("B")
+        width = array("d")
+        height = array("d")
+        radius = array("d")
+        for shape in shapes:
+            code = _kind_of(shape)
+            kind.append(code)
+            if code == CIRCLE:
+                width.append(0.0)
+                height.append(0.0)
+                radius.append(shape.radius)
+            elif hasattr(shape, "side"):
+                width.append(shape.side)
+                height.append(shape.side)
+                radius.append(0.0)
+            else:
+                width.append(shape.width)
+                height.append(shape.height)
+                radius.append(0.0)
+        return cls(np.frombuffer(kind, dtype=np.uint8), np.frombuffer(width),
+                   np.frombuffer(height), np.frombuffer(radius))
+
+    # Materialise the rows as objects again, lazily
+    def to_shapes(self, rectangle=Rectangle, square=Square, circle=Circle):
+        for code, w, h, r in zip(self.kind.tolist(), self.width.tolist(),
+                                 self.height.tolist(), self.radius.tolist()):
+            if code == CIRCLE:
+                yield circle(r)
+            elif code == SQUARE:
+                yield square(w)
+            else:
+                yield rectangle(w, h)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _area(self, start, stop, out):
+        np.multiply(self.width[start:stop], self.height[start:stop], out=out)
+        # float_power goes through libm pow() like `radius ** 2`, r * r can differ in the last bit
+        circle = np.float_power(self.radius[start:stop], 2)
+        circle *= math.pi
+        out += circle
+        return out
+
+    def area(self, out=None):
+        if out is None:
+            out = np.empty(len(self), dtype=np.float64)
+        return self._area(0, len(self), out)
+
+    def total_area(self):
+        # np.sum adds pairwise, so the total can differ from the sequential loop in the last bits
+        total = 0.0
+        buffer = np.empty(min(self.CHUNK, len(self)), dtype=np.float64)
+        for start in range(0, len(self), self.CHUNK):
+            stop = min(start + self.CHUNK, len(self))
+            total += self._area(start, stop, buffer[:stop - start]).sum()
+        return float(total)
+
+
+def random_shapes(n, seed=1):
+    rng = np.random.default_rng(seed)
+    kinds = rng.integers(0, 3, n)
+    sizes = rng.uniform(1, 100, (n, 2)).round(2)
+    shapes = []
+    for code, (a, b) in zip(kinds.tolist(), sizes.tolist()):
+        if code == CIRCLE:
+            shapes.append(Circle(a))
+        elif code == SQUARE:
+            shapes.append(Square(a))
+        else:
+            shapes.append(Rectangle(a, b))
+    return shapes
+
+
+def benchmark(n=2_000_000):
+    shapes = random_shapes(n)
+
+    start = time.perf_counter()
+    expected = get_total_area(shapes)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = ShapeBatch.from_shapes(shapes)
+    convert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = batch.total_area()
+    vectorised = time.perf_counter() - start
+
+    assert np.array_equal(batch.area(), [shape.area() for shape in shapes])
+    assert math.isclose(total, expected, rel_tol=1e-12)
+    print(f"{n} shapes")
+    print(f"object loop    : {loop * 1000:8.1f} ms")
+    print(f"from_shapes    : {convert * 1000:8.1f} ms (one-off)")
+    print(f"ShapeBatch     : {vectorised * 1000:8.1f} ms ({loop / vectorised:.0f}x)")
+
+
+if __name__ == "__main__":
+    shapes = [Rectangle(5, 4), Square(5), Circle(5)]
+    batch = ShapeBatch.from_shapes(shapes)
+    print(batch.area())
+    print(batch.total_area(), get_total_area(shapes))
+    print([type(shape).__name__ for shape in batch.to_shapes()])
+
+    benchmark()
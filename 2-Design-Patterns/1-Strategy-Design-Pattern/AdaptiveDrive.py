@@ -0,0 +1,144 @@
+'''
+Runtime strategy hot-swap with adaptive selection for DriveStrategy.
+
+A Vehicle in Examp3.py gets its DriveStrategy once, in the constructor. AdaptiveDriveStrategy is
+itself a DriveStrategy, so it plugs into any Vehicle unchanged, but behind it a StrategySelector
+
+    - times every call of the strategy that served it and keeps an EWMA of its latency
+    - every `explore_every` calls sends one call to another candidate that satisfies
+      `predicate`, so the latency of the strategies not in use stays up to date
+    - after each exploration call picks the fastest candidate that satisfies `predicate` and
+      makes it the current one
+
+The current strategy is a single attribute. A call only reads it, and a swap only assigns it
+(both atomic in CPython), so the read path takes no lock. Counters record how many calls every
+strategy served.
+'''
+import itertools
+import time
+
+from Examp3 import DriveStrategy, NormalDriveStrategy, SpecialDriveStrategy, Vehicle
+
+
+class StrategyStats:
+    def __init__(self):
+        self.ewma = None
+        self._served = itertools.count()
+        self.served = 0
+
+    def record(self, seconds, alpha):
+        # races between threads only blur the average, they can not corrupt it
+        self.ewma = seconds if self.ewma is None else alpha * seconds + (1 - alpha) * self.ewma
+        # next() on itertools.count is atomic, the counter never loses a call
+        self.served = next(self._served) + 1
+
+
+class StrategySelector:
+    def __init__(self, strategies, predicate=None, alpha=0.2, explore_every=100,
+                 clock=time.perf_counter):
+        if not strategies:
+            raise ValueError("at least one strategy is required")
+        self.strategies = list(strategies)
+        self.predicate = predicate or (lambda strategy: True)
+        self.alpha = alpha
+        self.explore_every = explore_every
+        self._clock = clock
+        self.stats = {id(strategy): StrategyStats() for strategy in self.strategies}
+        self._calls = itertools.count(1)
+        self._explored = itertools.count()
+        self.current = self._eligible()[0]
+
+    def _eligible(self):
+        eligible = [strategy for strategy in self.strategies if self.predicate(strategy)]
+        if not eligible:
+            raise ValueError("no strategy satisfies the predicate")
+        return eligible
+
+    # Manual hot-swap, e.g. from an operator console
+    def swap(self, strategy):
+        if id(strategy) not in self.stats:
+            raise ValueError("strategy is not registered with this selector")
+        self.current = strategy
+
+    def reselect(self):
+        eligible = self._eligible()
+        timed = [s for s in eligible if self.stats[id(s)].ewma is not None]
+        if timed:
+            self.current = min(timed, key=lambda s: self.stats[id(s)].ewma)
+
+    def call(self, method, *args):
+        strategy = self.current
+        exploring = next(self._calls) % self.explore_every == 0
+        if exploring:
+            # only strategies that satisfy the predicate may serve a call
+            others = [s for s in self._eligible() if s is not strategy]
+            if others:
+                strategy = others[next(self._explored) % len(others)]
+        start = self._clock()
+        try:
+            return getattr(strategy, method)(*args)
+        finally:
+            self.stats[id(strategy)].record(self._clock() - start, self.alpha)
+            if exploring:
+                self.reselect()
+
+    # strategy name -> (calls served, EWMA latency in seconds or None if never timed)
+    def report(self):
+        return {getattr(s, "name", type(s).__name__): (self.stats[id(s)].served, self.stats[id(s)].ewma)
+                for s in self.strategies}
+
+
+class AdaptiveDriveStrategy(DriveStrategy):
+    def __init__(self, selector: StrategySelector):
+        self.selector = selector
+
+    def drive(self):
+        return self.selector.call("drive")
+
+
+# Quiet drive strategies with a fixed cost, for the demo
+class TimedDriveStrategy(DriveStrategy):
+    def __init__(self, name, cost, offroad):
+        self.name = name
+        self.cost = cost
+        self.offroad = offroad
+
+    def drive(self):
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+
+
+class ConvoyVehicle(Vehicle):
+
+    def __init__(self, selector):
+        super().__init__(AdaptiveDriveStrategy(selector))
+
+
+if __name__ == "__main__":
+    # the built-in strategies print, they work the same behind the selector
+    selector = StrategySelector([NormalDriveStrategy(), SpecialDriveStrategy()], explore_every=2)
+    vehicle = Vehicle(AdaptiveDriveStrategy(selector))
+    for _ in range(4):
+        vehicle.drive()
+
+    slow = TimedDriveStrategy("slow", 0.0002, offroad=True)
+    fast = TimedDriveStrategy("fast", 0.00005, offroad=True)
+    fastest = TimedDriveStrategy("fastest", 0.00001, offroad=False)
+    selector = StrategySelector([slow, fast, fastest],
+                                predicate=lambda strategy: strategy.offroad, explore_every=50)
+    fleet = [ConvoyVehicle(selector) for _ in range(10)]
+    for _ in range(500):
+        for vehicle in fleet:
+            vehicle.drive()
+    print("serving now:", selector.current.name)
+    for name, (served, ewma) in selector.report().items():
+        latency = "never timed" if ewma is None else f"ewma {ewma * 1e6:.1f} us"
+        print(f"{name:8} served {served:5} calls, {latency}")
+
+    # speed changes at runtime, the selector follows
+    fast.cost = 0.0005
+    for _ in range(100):
+        for vehicle in fleet:
+            vehicle.drive()
+    print("after fast slowed down, serving:", selector.current.name)
@@ -0,0 +1,114 @@
+'''
+Vectorised backtesting of SellStrategy objects over price time series.
+
+TradingApp.sell_order applies one strategy to one balance at one fixed price. The backtest here
+runs a strategy over a whole price series for many portfolios at once:
+
+    prices      shape (T,) shared by all portfolios, or (P, T) one series per portfolio
+    btc, usdt   shape (P,) starting balances
+
+Every `every` ticks the strategy sells from each portfolio's BTC at that tick's price; the BTC left
+is what sell_crypto returns and the USDT it returns is added to the portfolio's USDT.
+
+SellAll / SellHalf / SellLittle only use arithmetic, so their sell_crypto works unchanged on
+whole NumPy arrays: each tick is one call for all P portfolios. Custom strategies opt in to the
+same path with a class attribute `vectorized = True`; any other strategy is assumed to work on
+plain floats only and is called once per portfolio per tick.
+'''
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from Examp1 import SellAll, SellHalf, SellLittle, SellStrategy
+
+
+BacktestResult = namedtuple(
+    "BacktestResult", ["btc", "usdt", "value", "portfolio_ticks", "seconds", "vectorized"])
+
+# Built-in strategies known to be plain arithmetic on their arguments
+VECTORIZED = (SellAll, SellHalf, SellLittle)
+
+
+def is_vectorized(strategy):
+    return getattr(strategy, "vectorized", False) or type(strategy) in VECTORIZED
+
+
+def backtest(strategy: SellStrategy, prices, btc, usdt=None, every=1):
+    prices = np.asarray(prices, dtype=np.float64)
+    btc = np.array(btc, dtype=np.float64)
+    usdt = np.zeros_like(btc) if usdt is None else np.array(usdt, dtype=np.float64)
+    if prices.ndim == 2 and prices.shape[0] != btc.shape[0]:
+        raise ValueError("per-portfolio prices must have one row per portfolio")
+
+    ticks = range(0, prices.shape[-1], every)
+    vectorized = is_vectorized(strategy)
+    start = time.perf_counter()
+    if vectorized:
+        for t in ticks:
+            result = strategy.sell_crypto(btc, prices[..., t])
+            btc[:] = result["btc"]
+            usdt += result["usdt"]
+    else:
+        sell_crypto = strategy.sell_crypto
+        for t in ticks:
+            column = np.broadcast_to(prices[..., t], btc.shape).tolist()
+            balances = btc.tolist()
+            for i, price in enumerate(column):
+                result = sell_crypto(balances[i], price)
+                btc[i] = result["btc"]
+                usdt[i] += result["usdt"]
+    seconds = time.perf_counter() - start
+
+    value = btc * prices[..., -1] + usdt
+    return BacktestResult(btc, usdt, value, len(ticks) * len(btc), seconds, vectorized)
+
+
+def throughput(result):
+    return result.portfolio_ticks / result.seconds if result.seconds else float("inf")
+
+
+# Sells a quarter, but only above a price, custom strategy with no vectorised form
+class SellAboveTarget(SellStrategy):
+    def __init__(self, target):
+        self.target = target
+
+    def sell_crypto(self, balance: float, currency: float) -> dict:
+        if currency < self.target:
+            return {"btc": balance, "usdt": 0.0}
+        return {"btc": balance * 0.75, "usdt": balance * 0.25 * currency}
+
+
+# Same rule written with array operations
+class SellAboveTargetVectorized(SellAboveTarget):
+    vectorized = True
+
+    def sell_crypto(self, balance, currency):
+        sell = np.where(currency < self.target, 0.0, 0.25)
+        return {"btc": balance * (1 - sell), "usdt": balance * sell * currency}
+
+
+def random_prices(ticks, seed=11):
+    rng = np.random.default_rng(seed)
+    return 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, ticks)))
+
+
+if __name__ == "__main__":
+    # Same two orders as Examp1.py, but USDT is accumulated instead of overwritten
+    result = backtest(SellLittle(), [30000], [100])
+    result = backtest(SellHalf(), [30000], result.btc, result.usdt)
+    print({"btc": float(result.btc[0]), "usdt": float(result.usdt[0])})
+
+    portfolios = 2000
+    prices = random_prices(50_000)
+    balances = np.random.default_rng(5).uniform(1, 100, portfolios)
+    for strategy in (SellAll(), SellHalf(), SellLittle(),
+                     SellAboveTargetVectorized(31000)):
+        result = backtest(strategy, prices, balances, every=100)
+        print(f"{type(strategy).__name__:26}: {throughput(result) / 1e6:8.1f} M portfolio-ticks/s")
+
+    # scalar fallback on a smaller run, must agree with the vectorised rule
+    scalar = backtest(SellAboveTarget(31000), prices[:5000], balances[:200], every=10)
+    vector = backtest(SellAboveTargetVectorized(31000), prices[:5000], balances[:200], every=10)
+    assert np.allclose(scalar.value, vector.value)
+    print(f"{'SellAboveTarget (scalar)':26}: {throughput(scalar) / 1e6:8.1f} M portfolio-ticks/s")
@@ -0,0 +1,147 @@
+'''
+Batch evaluation for the OperationStrategy calculator of Examp2.py.
+
+Calculator.calculate evaluates one pair per call. BatchCalculator adds
+
+    calculate_many(a, b)      whole arrays (or lists) in, one array out
+    calculate_stream(a, b)    iterables of any length in, one array per chunk out, so inputs
+                              that do not fit in memory (generators, files, np.memmap) can be
+                              processed chunk by chunk
+
+Each strategy is mapped to a NumPy kernel (Addition -> np.add, ...). A custom strategy can bring
+its own kernel by defining execute_many(a, b); otherwise execute() is called per pair.
+
+Division by zero follows the `errors` policy:
+    "raise"   raise ZeroDivisionError("division by zero") like Division.execute (default)
+    "mask"    return a numpy.ma masked array with the zero-division results masked
+    "nan"     put NaN where the divisor is zero
+'''
+import itertools
+import time
+
+import numpy as np
+
+from Examp2 import Addition, Calculator, Division, Multiplication, OperationStrategy, Subtraction
+
+
+ERROR_POLICIES = ("raise", "mask", "nan")
+
+_END = object()
+
+KERNELS = {
+    Addition: np.add,
+    Subtraction: np.subtract,
+    Multiplication: np.multiply,
+}
+
+
+def _divide(a, b, errors):
+    zero = b == 0
+    if not zero.any():
+        return np.true_divide(a, b)
+    if errors == "raise":
+        raise ZeroDivisionError("division by zero")
+    safe = np.where(zero, 1, b)
+    result = np.true_divide(a, safe)
+    if errors == "mask":
+        return np.ma.masked_array(result, mask=zero)
+    # np.where works for 0-d inputs too, where result is a NumPy scalar; [()] unwraps 0-d
+    return np.where(zero, np.nan, result)[()]
+
+
+class BatchCalculator(Calculator):
+    def __init__(self, strategy, errors="raise"):
+        super().__init__(strategy)
+        if errors not in ERROR_POLICIES:
+            raise ValueError(f"errors must be one of {ERROR_POLICIES}, got {errors!r}")
+        self.errors = errors
+
+    def _kernel(self, a, b):
+        # exact type, like KERNELS: a Division subclass may compute something else
+        if type(self.strategy) is Division:
+            return _divide(a, b, self.errors)
+        kernel = KERNELS.get(type(self.strategy))
+        if kernel is not None:
+            return kernel(a, b)
+        execute_many = getattr(self.strategy, "execute_many", None)
+        if execute_many is not None:
+            return execute_many(a, b)
+        # scalar-only strategy, one execute() per pair
+        execute = self.strategy.execute
+        results = [execute(x, y) for x, y in zip(a.ravel().tolist(), b.ravel().tolist())]
+        return np.array(results).reshape(a.shape)
+
+    def calculate_many(self, a, b):
+        a, b = np.broadcast_arrays(np.asarray(a), np.asarray(b))
+        return self._kernel(a, b)
+
+    def calculate_stream(self, a, b, chunk_size=1 << 16, dtype=np.float64):
+        '''
+        Yield the results chunk by chunk. With errors="raise" the ZeroDivisionError is raised
+        when the chunk holding the zero divisor is reached; earlier chunks are already yielded.
+        '''
+        if isinstance(a, np.ndarray) and isinstance(b, np.ndarray):
+            if len(a) != len(b):
+                raise ValueError("a and b must have the same length")
+            for start in range(0, len(a), chunk_size):
+                yield self._kernel(a[start:start + chunk_size], b[start:start + chunk_size])
+            return
+        a = iter(a)
+        b = iter(b)
+        while True:
+            left = np.fromiter(itertools.islice(a, chunk_size), dtype=dtype)
+            right = np.fromiter(itertools.islice(b, len(left)), dtype=dtype)
+            if not len(left):
+                if next(b, _END) is not _END:
+                    raise ValueError("a and b must have the same length")
+                return
+            if len(right) != len(left):
+                raise ValueError("a and b must have the same length")
+            yield self._kernel(left, right)
+
+
+# Custom strategy without a NumPy kernel, uses the per-pair fallback
+class Power(OperationStrategy):
+    def execute(self, num1, num2):
+        return num1 ** num2
+
+
+def benchmark(n=2_000_000):
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-100, 100, n)
+    b = rng.uniform(1, 100, n)
+    pairs = list(zip(a.tolist(), b.tolist()))
+    for strategy in (Addition(), Subtraction(), Multiplication(), Division()):
+        calculator = BatchCalculator(strategy)
+        start = time.perf_counter()
+        for x, y in pairs:
+            calculator.calculate(x, y)
+        scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        calculator.calculate_many(a, b)
+        batch = time.perf_counter() - start
+        print(f"{type(strategy).__name__:15}: calculate {n / scalar / 1e6:6.1f} M pairs/s, "
+              f"calculate_many {n / batch / 1e6:8.1f} M pairs/s")
+
+
+if __name__ == "__main__":
+    div = BatchCalculator(Division(), errors="mask")
+    print(div.calculate_many([5, 6, 7], [3, 0, 2]))
+
+    div = BatchCalculator(Division(), errors="nan")
+    print(div.calculate_many([5, 6, 7], [3, 0, 2]), div.calculate_many(5, 0))
+
+    try:
+        BatchCalculator(Division()).calculate_many([5, 6], [3, 0])
+    except ZeroDivisionError as error:
+        print("raise:", error)
+
+    print(BatchCalculator(Power()).calculate_many([2, 3], [10, 2]))
+
+    # 10M pairs from generators, never held in memory at once
+    add = BatchCalculator(Addition())
+    total = sum(chunk.sum() for chunk in add.calculate_stream(
+        (i for i in range(10_000_000)), itertools.repeat(1.0, 10_000_000)))
+    print("stream total:", total)
+
+    benchmark()
@@ -46,8 +46,10 @@ class SellLittle(SellStrategy):
 
 class TradingApp:
 
-    assets = {"btc": 100, "usdt": 0}
-    currency = 30000
+    # every app owns its portfolio, so several apps can run side by side
+    def __init__(self, btc=100, usdt=0, currency=30000):
+        self.assets = {"btc": btc, "usdt": usdt}
+        self.currency = currency
 
     def sell_order(self, sell_decision: SellStrategy):
         self.assets = sell_decision.sell_crypto(
@@ -55,10 +57,11 @@ class TradingApp:
         return self.assets
 
 
-A = TradingApp()
-assets = A.sell_order(SellLittle())
-print(assets)
-#Out: {'btc': 90.0, 'usdt': 300000.0}
-assets = A.sell_order(SellHalf())
-print(assets)
-#Out: {'btc': 45.0, 'usdt': 1350000.0}
+if __name__ == "__main__":
+    A = TradingApp()
+    assets = A.sell_order(SellLittle())
+    print(assets)
+    #Out: {'btc': 90.0, 'usdt': 300000.0}
+    assets = A.sell_order(SellHalf())
+    print(assets)
+    #Out: {'btc': 45.0, 'usdt': 1350000.0}
@@ -37,19 +37,20 @@ class Calculator:
         return self.strategy.execute(num1, num2)
 
 
-add = Calculator(Addition())
-result = add.calculate(5, 3)
-print(result)
+if __name__ == "__main__":
+    add = Calculator(Addition())
+    result = add.calculate(5, 3)
+    print(result)
 
-sub = Calculator(Subtraction())
-result = sub.calculate(5, 3)
-print(result)  # Output: 2
+    sub = Calculator(Subtraction())
+    result = sub.calculate(5, 3)
+    print(result)  # Output: 2
 
 
-mul = Calculator(Multiplication())
-result = mul.calculate(5, 3)
-print(result)
+    mul = Calculator(Multiplication())
+    result = mul.calculate(5, 3)
+    print(result)
 
-div = Calculator(Division())
-result = div.calculate(5, 3)
-print(result)
+    div = Calculator(Division())
+    result = div.calculate(5, 3)
+    print(result)
@@ -74,5 +74,6 @@ class OffloadVehicle(Vehicle):
         super().__init__(SpecialDriveStrategy())
 
 
-d1 = OffloadVehicle()
-d1.drive()
+if __name__ == "__main__":
+    d1 = OffloadVehicle()
+    d1.drive()
@@ -0,0 +1,291 @@
+'''
+Expression pipeline built from OperationStrategy nodes.
+
+Chaining Calculator(Addition()), Calculator(Multiplication()), ... evaluates a formula one
+object hop per operation per value. Here a formula is built once as a DAG of OperationStrategy
+nodes
+
+    x, y = col("x"), col("y")
+    expr = (x + y) * (x + y) / 2 + 3 * 4
+
+and compile() turns it into a plan that
+    - folds constant sub-expressions (3 * 4 -> 12) with the strategy's own execute()
+    - drops x * 1, x / 1 and x - 0, which are exact no-ops
+    - evaluates every common sub-expression once ((x + y) above is computed a single time);
+      operands of Addition / Multiplication are put in a canonical order so y + x matches x + y
+    - runs the remaining operations block by block over the input columns, each step writing
+      into a preallocated block-sized buffer (out=), so the intermediates stay in cache and no
+      full-length temporary is allocated for them
+
+Division keeps the semantics of Division.execute: a zero divisor raises ZeroDivisionError.
+'''
+import time
+
+import numpy as np
+
+from Examp2 import Addition, Calculator, Division, Multiplication, OperationStrategy, Subtraction
+
+
+KERNELS = {
+    Addition: np.add,
+    Subtraction: np.subtract,
+    Multiplication: np.multiply,
+    Division: np.true_divide,
+}
+COMMUTATIVE = (Addition, Multiplication)
+# right operand that leaves the left one unchanged
+IDENTITY = {Subtraction: 0, Multiplication: 1, Division: 1}
+
+
+class Expr:
+    def apply(self, strategy: OperationStrategy, other):
+        return Op(strategy, self, _wrap(other))
+
+    def __add__(self, other):
+        return Op(Addition(), self, _wrap(other))
+
+    def __radd__(self, other):
+        return Op(Addition(), _wrap(other), self)
+
+    def __sub__(self, other):
+        return Op(Subtraction(), self, _wrap(other))
+
+    def __rsub__(self, other):
+        return Op(Subtraction(), _wrap(other), self)
+
+    def __mul__(self, other):
+        return Op(Multiplication(), self, _wrap(other))
+
+    def __rmul__(self, other):
+        return Op(Multiplication(), _wrap(other), self)
+
+    def __truediv__(self, other):
+        return Op(Division(), self, _wrap(other))
+
+    def __rtruediv__(self, other):
+        return Op(Division(), _wrap(other), self)
+
+    def compile(self):
+        return CompiledExpression(self)
+
+
+class Column(Expr):
+    def __init__(self, name):
+        self.name = name
+
+
+class Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+
+class Op(Expr):
+    def __init__(self, strategy, left, right):
+        self.strategy = strategy
+        self.left = left
+        self.right = right
+
+
+def col(name):
+    return Column(name)
+
+
+def _wrap(value):
+    return value if isinstance(value, Expr) else Const(value)
+
+
+class CompiledExpression:
+    def __init__(self, root):
+        # canonical node table: every distinct sub-expression gets one id
+        self._ids = {}
+        self._nodes = []
+        self._strategies = {}
+        root_id = self._canonical(root)
+        self.steps, self.buffers = self._schedule(root_id)
+        self.result = self._nodes[root_id]
+
+    def _intern(self, node):
+        node_id = self._ids.get(node)
+        if node_id is None:
+            node_id = self._ids[node] = len(self._nodes)
+            self._nodes.append(node)
+        return node_id
+
+    # Post-order walk with an explicit stack, deep expressions do not hit the recursion limit
+    def _canonical(self, root):
+        done = {}
+        stack = [(root, False)]
+        while stack:
+            expr, children_done = stack.pop()
+            if id(expr) in done:
+                continue
+            if isinstance(expr, Column):
+                done[id(expr)] = self._intern(("col", expr.name))
+            elif isinstance(expr, Const):
+                done[id(expr)] = self._intern(("const", expr.value))
+            elif not children_done:
+                stack.append((expr, True))
+                stack.append((expr.right, False))
+                stack.append((expr.left, False))
+            else:
+                done[id(expr)] = self._fold(expr, done[id(expr.left)], done[id(expr.right)])
+        return done[id(root)]
+
+    def _fold(self, expr, left_id, right_id):
+        strategy = expr.strategy
+        cls = type(strategy)
+        left, right = self._nodes[left_id], self._nodes[right_id]
+        if left[0] == "const" and right[0] == "const":
+            return self._intern(("const", strategy.execute(left[1], right[1])))
+        if cls in IDENTITY and right == ("const", IDENTITY[cls]):
+            return left_id
+        if cls in COMMUTATIVE and left_id > right_id:
+            left_id, right_id = right_id, left_id
+        # built-in strategies are stateless, any instance of the class is the same operation
+        key = cls if cls in KERNELS else strategy
+        node_id = self._intern(("op", key, left_id, right_id))
+        self._strategies.setdefault(node_id, strategy)
+        return node_id
+
+    def _schedule(self, root_id):
+        # ops only, in id order: children are always interned before their parents
+        op_ids = [i for i, node in enumerate(self._nodes) if node[0] == "op"]
+        reachable = set()
+        stack = [root_id]
+        while stack:
+            node_id = stack.pop()
+            if node_id in reachable:
+                continue
+            reachable.add(node_id)
+            node = self._nodes[node_id]
+            if node[0] == "op":
+                stack += [node[2], node[3]]
+        op_ids = [i for i in op_ids if i in reachable]
+        self.columns = sorted(self._nodes[i][1] for i in reachable if self._nodes[i][0] == "col")
+
+        last_use = {}
+        for position, node_id in enumerate(op_ids):
+            node = self._nodes[node_id]
+            last_use[node[2]] = position
+            last_use[node[3]] = position
+
+        # give every op a buffer, reuse buffers whose value is no longer needed
+        slot_of = {}
+        free = []
+        buffers = 0
+        steps = []
+        for position, node_id in enumerate(op_ids):
+            _, _, left_id, right_id = self._nodes[node_id]
+            strategy = self._strategies[node_id]
+            cls = type(strategy)
+            operands = [self._operand(left_id, slot_of), self._operand(right_id, slot_of)]
+            for child in {left_id, right_id}:
+                if child in slot_of and last_use.get(child) == position and child != root_id:
+                    free.append(slot_of[child])
+            if free:
+                slot = free.pop()
+            else:
+                slot = buffers
+                buffers += 1
+            slot_of[node_id] = slot
+            steps.append((strategy, cls, operands, slot))
+        return steps, buffers
+
+    def _operand(self, node_id, slot_of):
+        node = self._nodes[node_id]
+        if node[0] == "op":
+            return ("buf", slot_of[node_id])
+        return node[:2]
+
+    def __call__(self, block_size=1 << 14, **columns):
+        if self.result[0] == "const":
+            return self.result[1]
+        arrays = {name: np.asarray(columns[name], dtype=np.float64) for name in self.columns}
+        length = len(next(iter(arrays.values())))
+        if self.result[0] == "col":
+            return arrays[self.result[1]].copy()
+
+        out = np.empty(length, dtype=np.float64)
+        buffers = [np.empty(block_size, dtype=np.float64) for _ in range(self.buffers)]
+        for start in range(0, length, block_size):
+            stop = min(start + block_size, length)
+            size = stop - start
+            view = [buffer[:size] for buffer in buffers]
+            for strategy, cls, operands, slot in self.steps:
+                a, b = [self._fetch(operand, arrays, view, start, stop) for operand in operands]
+                if cls is Division and not np.all(b):
+                    raise ZeroDivisionError("division by zero")
+                kernel = KERNELS.get(cls)
+                if kernel is not None:
+                    kernel(a, b, out=view[slot])
+                else:
+                    # strategy without a NumPy kernel
+                    view[slot][:] = np.frompyfunc(strategy.execute, 2, 1)(a, b)
+            out[start:stop] = view[self.steps[-1][3]]
+        return out
+
+    @staticmethod
+    def _fetch(operand, arrays, view, start, stop):
+        kind, value = operand
+        if kind == "buf":
+            return view[value]
+        if kind == "col":
+            return arrays[value][start:stop]
+        return value
+
+
+# Same formula evaluated one Calculator per operation, on whole arrays
+def step_by_step(x, y):
+    add, mul, div, sub = (Calculator(Addition()), Calculator(Multiplication()),
+                          Calculator(Division()), Calculator(Subtraction()))
+    s1 = add.calculate(x, y)
+    s2 = add.calculate(x, y)
+    p = mul.calculate(s1, s2)
+    q = div.calculate(p, 2)
+    r = sub.calculate(q, mul.calculate(x, 1))
+    return add.calculate(r, mul.calculate(3, 4))
+
+
+def benchmark(rows=10_000_000):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1, 1, rows)
+    y = rng.uniform(-1, 1, rows)
+    x_, y_ = col("x"), col("y")
+    compiled = ((x_ + y_) * (y_ + x_) / 2 - x_ * 1 + 3 * 4).compile()
+    print(f"{len(compiled.steps)} fused steps, {compiled.buffers} block buffers")
+
+    start = time.perf_counter()
+    expected = step_by_step(x, y)
+    unfused = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fused = compiled(x=x, y=y)
+    elapsed = time.perf_counter() - start
+    assert np.array_equal(fused, expected)
+
+    sample = 100_000
+    start = time.perf_counter()
+    xs, ys = x[:sample].tolist(), y[:sample].tolist()
+    for a, b in zip(xs, ys):
+        step_by_step(a, b)
+    per_value = (time.perf_counter() - start) * rows / sample
+
+    print(f"{rows} rows")
+    print(f"Calculator per value (extrapolated): {per_value:7.2f} s")
+    print(f"Calculator per op on whole arrays  : {unfused:7.2f} s")
+    print(f"compiled, fused blocks             : {elapsed:7.2f} s")
+
+
+if __name__ == "__main__":
+    x, y = col("x"), col("y")
+    compiled = ((x + y) * (y + x) / 2 + 3 * 4).compile()
+    for step in compiled.steps:
+        print(type(step[0]).__name__, step[2], "-> buffer", step[3])
+    print(compiled(x=[1, 2, 3], y=[1, 1, 1]))
+
+    try:
+        (x / (y - 1)).compile()(x=[1, 2], y=[2, 1])
+    except ZeroDivisionError as error:
+        print("raise:", error)
+
+    benchmark()
@@ -0,0 +1,174 @@
+'''
+Allocation free order path for SellStrategy.
+
+Every sell_crypto call in Examp1.py builds a new {"btc": ..., "usdt": ...} dict and
+TradingApp.sell_order swaps self.assets for it. On a hot trading loop that is one dict
+allocation and two key hashes per order.
+
+Balance is a two-field record with __slots__ (no per-instance __dict__). Strategies written for
+this path implement sell_into(balance, currency, out) and write the result into a Balance the
+caller already owns. sell_crypto keeps working for old callers and wraps sell_into in a new dict.
+
+The saving only shows once the strategy lookup is out of the loop as well. FastTradingApp.seller
+(strategy) resolves the strategy's sell_into once and returns a function that places one order
+per call. Measured here (CPython 3.11, 200k orders, p50 / p99):
+
+    TradingApp.sell_order(strategy)       ~ 720 / 880 ns
+    FastTradingApp.sell_order(strategy)   ~ 760 / 880 ns   looks the strategy up on every order
+    FastTradingApp.seller(strategy)()     ~ 450 / 550 ns
+'''
+import gc
+import time
+from abc import abstractmethod
+
+from Examp1 import SellHalf, SellStrategy, TradingApp
+
+
+class Balance:
+    __slots__ = ("btc", "usdt")
+
+    def __init__(self, btc=0.0, usdt=0.0):
+        self.btc = btc
+        self.usdt = usdt
+
+    @classmethod
+    def from_dict(cls, assets):
+        return cls(assets["btc"], assets["usdt"])
+
+    def as_dict(self):
+        return {"btc": self.btc, "usdt": self.usdt}
+
+    def __repr__(self):
+        return f"Balance(btc={self.btc!r}, usdt={self.usdt!r})"
+
+
+class InPlaceSellStrategy(SellStrategy):
+    @abstractmethod
+    def sell_into(self, balance: float, currency: float, out: Balance) -> Balance:
+        """sells crypto and writes the new balance into out"""
+
+    # dict API of SellStrategy, for existing callers
+    def sell_crypto(self, balance: float, currency: float) -> dict:
+        return self.sell_into(balance, currency, Balance()).as_dict()
+
+
+class SellAllInPlace(InPlaceSellStrategy):
+
+    def sell_into(self, balance: float, currency: float, out: Balance) -> Balance:
+        """critical!! Market doesn't look nice. Sell!"""
+        out.btc = 0
+        out.usdt = balance * currency
+        return out
+
+
+class SellHalfInPlace(InPlaceSellStrategy):
+
+    def sell_into(self, balance: float, currency: float, out: Balance) -> Balance:
+        """ cautious! let's sell half and wait! """
+        out.btc = balance / 2
+        out.usdt = (balance / 2) * currency
+        return out
+
+
+class SellLittleInPlace(InPlaceSellStrategy):
+
+    def sell_into(self, balance: float, currency: float, out: Balance) -> Balance:
+        """ HODL! """
+        out.btc = balance * 0.9
+        out.usdt = (balance * 0.1) * currency
+        return out
+
+
+# The strategy's sell_into(balance, currency, out), resolved once; strategies that only have
+# sell_crypto get a wrapper that copies the returned dict into out
+def bind_sell_into(strategy: SellStrategy):
+    method = getattr(strategy, "sell_into", None)
+    if method is not None:
+        return method
+    sell_crypto = strategy.sell_crypto
+
+    def sell_into(balance: float, currency: float, out: Balance) -> Balance:
+        result = sell_crypto(balance, currency)
+        out.btc = result["btc"]
+        out.usdt = result["usdt"]
+        return out
+    return sell_into
+
+
+class FastTradingApp:
+
+    def __init__(self, btc=100, usdt=0, currency=30000):
+        self.assets = Balance(btc, usdt)
+        self.currency = currency
+
+    # Same result as TradingApp.sell_order, written into the existing Balance; strategies
+    # that only have sell_crypto go through the bind_sell_into wrapper
+    def sell_order(self, sell_decision: SellStrategy):
+        return bind_sell_into(sell_decision)(self.assets.btc, self.currency, self.assets)
+
+    # For a hot loop on one strategy: the strategy is resolved once, every call is one order
+    def seller(self, sell_decision: SellStrategy):
+        sell_into = bind_sell_into(sell_decision)
+        assets = self.assets
+
+        def sell_order():
+            return sell_into(assets.btc, self.currency, assets)
+        return sell_order
+
+
+def _percentiles(samples):
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def benchmark(orders=200_000):
+    clock = time.perf_counter_ns
+    dict_app = TradingApp()
+    slots_app = FastTradingApp()
+
+    # refill the balance between orders (not timed) so it never decays to denormals
+    def refill_dict():
+        dict_app.assets["btc"] = 100
+
+    def refill_slots():
+        slots_app.assets.btc = 100
+
+    paths = [
+        ("dict  TradingApp.sell_order", dict_app.sell_order, SellHalf(), refill_dict),
+        ("slots FastTradingApp.sell_order", slots_app.sell_order, SellHalfInPlace(), refill_slots),
+        ("slots FastTradingApp.seller", None, SellHalfInPlace(), refill_slots),
+    ]
+    gc.disable()
+    try:
+        for name, sell_order, strategy, refill in paths:
+            # the same call shape for every path, so they pay the same call overhead
+            if sell_order is None:
+                sell_order, args = slots_app.seller(strategy), ()
+            else:
+                args = (strategy,)
+            samples = [0] * orders
+            for i in range(orders):
+                refill()
+                start = clock()
+                sell_order(*args)
+                samples[i] = clock() - start
+            p50, p99 = _percentiles(samples)
+            print(f"{name:32}: p50 {p50:5} ns, p99 {p99:6} ns")
+    finally:
+        gc.enable()
+
+
+if __name__ == "__main__":
+    A = FastTradingApp()
+    print(A.sell_order(SellLittleInPlace()))
+    #Out: Balance(btc=90.0, usdt=300000.0)
+    print(A.sell_order(SellHalfInPlace()))
+    #Out: Balance(btc=45.0, usdt=1350000.0)
+
+    # existing strategies work on the in-place path too
+    print(FastTradingApp().sell_order(SellHalf()))
+
+    # old dict API still works
+    print(SellAllInPlace().sell_crypto(45.0, 30000))
+
+    benchmark()
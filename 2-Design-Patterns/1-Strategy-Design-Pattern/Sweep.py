@@ -0,0 +1,130 @@
+'''
+Parallel strategy sweep over (strategy x parameter x portfolio) combinations.
+
+Every combination is a backtest (see Backtest.py). The sweep splits the portfolios into chunks
+and sends one task per (strategy, parameters, chunk) to a ProcessPoolExecutor.
+
+The price series and the starting balances are copied once into shared memory. A task only
+carries the shared memory names and a slice of portfolio indices, so a multi-gigabyte price
+series is never pickled per task; each worker process attaches to the blocks once, in its
+initializer. The per-chunk results are combined into one SweepResult per (strategy, parameters).
+'''
+import itertools
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Backtest import SellAboveTargetVectorized, backtest, random_prices
+from Examp1 import SellAll, SellHalf, SellLittle, TradingApp
+
+
+SweepResult = namedtuple(
+    "SweepResult", ["strategy", "params", "portfolios", "mean_value", "best_value", "worst_value"])
+
+
+class SharedArray:
+    '''
+    A NumPy array living in a multiprocessing shared memory block.
+    The creating process owns the block and must close() it.
+    '''
+
+    def __init__(self, array=None, spec=None):
+        if spec is None:
+            array = np.ascontiguousarray(array)
+            self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self.spec = (self._shm.name, array.shape, array.dtype.str)
+            self.array = np.ndarray(array.shape, array.dtype, buffer=self._shm.buf)
+            self.array[...] = array
+            self._owner = True
+        else:
+            name, shape, dtype = spec
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.spec = spec
+            self.array = np.ndarray(shape, np.dtype(dtype), buffer=self._shm.buf)
+            self._owner = False
+
+    def close(self):
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# Attached once per worker process
+_worker = {}
+
+
+def _attach(price_spec, balance_spec):
+    _worker["prices"] = SharedArray(spec=price_spec)
+    _worker["balances"] = SharedArray(spec=balance_spec)
+
+
+def _run_task(strategy_cls, params, start, stop, every):
+    prices = _worker["prices"].array
+    balances = _worker["balances"].array[start:stop]
+    if prices.ndim == 2:
+        prices = prices[start:stop]
+    result = backtest(strategy_cls(**params), prices, balances, every=every)
+    value = result.value
+    return value.sum(), value.max(), value.min(), len(value)
+
+
+def sweep(grid, prices, balances, workers=None, chunk_size=1000, every=1):
+    '''
+    grid: list of (strategy class, list of keyword-argument dicts)
+    prices: (T,) or (P, T) array, balances: (P,) starting BTC per portfolio
+    '''
+    shared_prices = SharedArray(np.asarray(prices, dtype=np.float64))
+    shared_balances = SharedArray(np.asarray(balances, dtype=np.float64))
+    try:
+        chunks = [(start, min(start + chunk_size, len(balances)))
+                  for start in range(0, len(balances), chunk_size)]
+        combos = [(cls, params) for cls, param_list in grid for params in param_list]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shared_prices.spec, shared_balances.spec)) as pool:
+            futures = {
+                (i, chunk): pool.submit(_run_task, cls, params, chunk[0], chunk[1], every)
+                for (i, (cls, params)), chunk in itertools.product(enumerate(combos), chunks)
+            }
+            results = []
+            for i, (cls, params) in enumerate(combos):
+                parts = [futures[(i, chunk)].result() for chunk in chunks]
+                total = sum(part[0] for part in parts)
+                count = sum(part[3] for part in parts)
+                results.append(SweepResult(
+                    cls.__name__, params, count, total / count,
+                    max(part[1] for part in parts), min(part[2] for part in parts)))
+        return results
+    finally:
+        shared_prices.close()
+        shared_balances.close()
+
+
+GRID = [
+    (SellAll, [{}]),
+    (SellHalf, [{}]),
+    (SellLittle, [{}]),
+    (SellAboveTargetVectorized, [{"target": target} for target in (29000, 30000, 31000, 32000)]),
+]
+
+
+if __name__ == "__main__":
+    # TradingApp keeps its portfolio per instance now, two apps no longer share assets
+    app_1 = TradingApp()
+    app_2 = TradingApp(btc=10)
+    app_1.sell_order(SellHalf())
+    print(app_1.assets, app_2.assets)
+
+    prices = random_prices(20_000)
+    balances = np.random.default_rng(5).uniform(1, 100, 20_000)
+    cores = os.cpu_count() or 1
+    for workers in sorted({1, cores}):
+        start = time.perf_counter()
+        results = sweep(GRID, prices, balances, workers=workers, chunk_size=2500, every=10)
+        print(f"{workers:3} workers: {time.perf_counter() - start:6.2f} s")
+    for result in sorted(results, key=lambda r: r.mean_value, reverse=True):
+        print(f"{result.strategy:26} {str(result.params):18} mean {result.mean_value:14.0f}")
@@ -0,0 +1,182 @@
+'''
+Async variant of the Observable used in Examp1.py / Examp2.py / Notify.py.
+
+The sync observables call observer.update() one after another on the caller's thread, so a slow
+email observer holds up every mobile observer behind it. AsyncObservable.notify() instead runs
+every observer's `async def update` as its own task, with
+    - a semaphore bounding how many updates run at the same time
+    - a per-observer timeout
+and returns a NotifySummary with delivered / timed-out / failed counts once all of them settle.
+
+Existing observers with a plain `def update` are wrapped in SyncObserverAdapter, which runs them
+in a worker thread so they do not block the event loop. Each observable has its own pool of
+max_concurrency threads for them: on the loop's shared default pool (a handful of threads) the
+updates would queue, and the time spent waiting would count against their timeout.
+'''
+import asyncio
+import contextlib
+import inspect
+import io
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from Examp2 import EmailAlertObserver, MobileAlertObserver
+
+
+NotifySummary = namedtuple("NotifySummary", ["delivered", "timed_out", "failed"])
+
+
+# Observer Interface
+class AsyncObserver(ABC):
+    @abstractmethod
+    async def update(self, *args):
+        pass
+
+
+# Lets the existing sync observers (EmailAlertObserver, User, ...) be added to an AsyncObservable
+class SyncObserverAdapter(AsyncObserver):
+    # executor=None runs on the event loop's default thread pool
+    def __init__(self, observer, executor=None):
+        self.observer = observer
+        self.executor = executor
+
+    async def update(self, *args):
+        # On timeout the await is cancelled but the thread finishes the call in the background
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.observer.update, *args)
+
+
+class AsyncObservable:
+    def __init__(self, max_concurrency=100, timeout=5.0):
+        self._observers = []
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        # threads for the sync observers, started on first use
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="observer")
+
+    # Add an observer, plain sync observers get wrapped automatically
+    def add(self, observer):
+        if not inspect.iscoroutinefunction(observer.update):
+            observer = SyncObserverAdapter(observer, self._executor)
+        self._observers.append(observer)
+
+    def remove(self, observer):
+        for registered in self._observers:
+            if registered is observer or getattr(registered, "observer", None) is observer:
+                self._observers.remove(registered)
+                return
+
+    async def notify(self, *args):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def deliver(observer):
+            async with semaphore:
+                await asyncio.wait_for(observer.update(*args), self.timeout)
+
+        results = await asyncio.gather(
+            *(deliver(observer) for observer in list(self._observers)),
+            return_exceptions=True)
+
+        delivered = timed_out = failed = 0
+        for result in results:
+            if result is None:
+                delivered += 1
+            elif isinstance(result, asyncio.TimeoutError):
+                timed_out += 1
+            else:
+                failed += 1
+        return NotifySummary(delivered, timed_out, failed)
+
+
+class AsyncWeatherStationObservable(AsyncObservable):
+    def __init__(self, max_concurrency=100, timeout=5.0):
+        super().__init__(max_concurrency, timeout)
+        self._temp = None
+
+    # Whenever temperature gets update notify all the observer
+    async def setTemp(self, new_temperature):
+        if self._temp == new_temperature:
+            return NotifySummary(0, 0, 0)
+        self._temp = new_temperature
+        return await self.notify()
+
+    def getTemp(self):
+        return self._temp
+
+
+class AsyncIphoneObservable(AsyncObservable):
+    def __init__(self, max_concurrency=100, timeout=5.0):
+        super().__init__(max_concurrency, timeout)
+        self._stockCount = 0
+
+    # Whenever stock gets update notify all the observer
+    async def setStockCount(self, newCount):
+        summary = NotifySummary(0, 0, 0)
+        if self._stockCount == 0:
+            summary = await self.notify()
+        self._stockCount += newCount
+        return summary
+
+    def getStockCount(self):
+        return self._stockCount
+
+
+class AsyncTvDisplayObserver(AsyncObserver):
+    def __init__(self, observable, delay=0.0):
+        self.observable = observable
+        self.delay = delay
+
+    async def update(self, *args):
+        await asyncio.sleep(self.delay)
+        print(f"Render the new temperature in TV which is {self.observable.getTemp()} degree C")
+
+
+class FailingObserver(AsyncObserver):
+    async def update(self, *args):
+        raise ConnectionError("display offline")
+
+
+class SlowSyncObserver:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def update(self, *args):
+        time.sleep(self.delay)
+
+
+async def main():
+    station = AsyncWeatherStationObservable(max_concurrency=10, timeout=0.5)
+    station.add(AsyncTvDisplayObserver(station))
+    station.add(AsyncTvDisplayObserver(station, delay=2))
+    station.add(FailingObserver())
+    print(await station.setTemp(10))
+
+    iphone = AsyncIphoneObservable()
+    iphone.add(EmailAlertObserver('keshav@email.com', iphone))
+    iphone.add(MobileAlertObserver('Keshav', iphone))
+    print(await iphone.setStockCount(11))
+
+    # 1000 observers that each take 10 ms: serial notify would need ~10 s
+    slow = AsyncObservable(max_concurrency=200, timeout=1.0)
+    for _ in range(1000):
+        slow.add(AsyncTvDisplayObserver(station, delay=0.01))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = await slow.notify()
+    print(f"{summary} in {time.perf_counter() - start:.2f} s")
+
+    # more sync observers than the default thread pool has workers, all well inside the timeout
+    blocking = AsyncObservable(max_concurrency=50, timeout=1.0)
+    for _ in range(50):
+        blocking.add(SlowSyncObserver(0.2))
+    start = time.perf_counter()
+    summary = await blocking.notify()
+    assert summary == NotifySummary(50, 0, 0), summary
+    print(f"{summary} in {time.perf_counter() - start:.2f} s (50 sync observers)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
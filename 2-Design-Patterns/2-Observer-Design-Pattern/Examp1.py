@@ -5,6 +5,8 @@ changes in their state.
 # Notify all subscriber about the temprature  change
 from abc import ABC, abstractmethod
 
+from ObserverRegistry import ObserverRegistry
+
 # Observable Interface
 
 
@@ -38,11 +40,14 @@ class Observer(ABC):
 
 class WeatherStationObservable(Observable):
     _temp = None
-    _observers = []
+
+    def __init__(self):
+        # per instance and weakly referenced, see ObserverRegistry.py
+        self._observers = ObserverRegistry()
 
     # Add an observer
     def add(self, observer):
-        self._observers.append(observer)
+        self._observers.add(observer)
 
     def remove(self, observer):
         self._observers.remove(observer)
@@ -83,20 +88,21 @@ class TvDisplayObserver(Observer):
             f"Render the new temperature in TV which is {self.observable.getTemp()} degree C")
 
 
-# Create the observable
-observable = WeatherStationObservable()
+if __name__ == "__main__":
+    # Create the observable
+    observable = WeatherStationObservable()
 
-# Create the observers and subscribed to observable
-observer_1 = MobileDisplayObserver(observable)
-observable.add(observer_1)
-observer_2 = TvDisplayObserver(observable)
-observable.add(observer_2)
+    # Create the observers and subscribed to observable
+    observer_1 = MobileDisplayObserver(observable)
+    observable.add(observer_1)
+    observer_2 = TvDisplayObserver(observable)
+    observable.add(observer_2)
 
-# Set the temperature
-observable.setTemp(10)
-observable.setTemp(10)
+    # Set the temperature
+    observable.setTemp(10)
+    observable.setTemp(10)
 
-# Revome observer
-observable.remove(observer_2)
+    # Revome observer
+    observable.remove(observer_2)
 
-observable.setTemp(12)
+    observable.setTemp(12)
@@ -2,6 +2,8 @@
 
 from abc import ABC, abstractmethod
 
+from ObserverRegistry import ObserverRegistry
+
 # Observable Interface
 
 
@@ -29,11 +31,14 @@ class StockObservable(ABC):
 
 class IphoneObservable(StockObservable):
     _stockCount = 0
-    _observers = []
+
+    def __init__(self):
+        # per instance and weakly referenced, see ObserverRegistry.py
+        self._observers = ObserverRegistry()
 
     # Add an observer
     def add(self, observer):
-        self._observers.append(observer)
+        self._observers.add(observer)
 
     def remove(self, observer):
         self._observers.remove(observer)
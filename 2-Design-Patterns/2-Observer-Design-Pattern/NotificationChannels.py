@@ -0,0 +1,235 @@
+'''
+Batched, coalescing notification channels for the alert observers of Examp2.py.
+
+EmailAlertObserver / MobileAlertObserver send one message per update() call. Here the observers
+only publish into a NotificationChannel, one per transport, which
+    - drops duplicates (same recipient, same item) seen again within `coalesce_window` seconds
+    - buffers the rest and hands them to the transport sink in batches
+    - flushes when the buffer reaches `max_batch` messages or the oldest message is older than
+      `flush_interval` seconds (checked on publish and by an optional background flusher)
+    - puts a batch the sink failed to send back in the buffer, so the next flush retries it
+
+FakeSmtpSink / FakeSmsSink are in-process stand-ins for the real gateways so throughput and
+flush latency can be measured offline.
+'''
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from Examp2 import IphoneObservable, NotificationAlertObserver
+
+
+# Transport Interface
+class TransportSink(ABC):
+    @abstractmethod
+    def send_batch(self, messages):
+        pass
+
+
+class FakeSinkBase(TransportSink):
+    # per_call_cost / per_message_cost simulate gateway round trip and payload time
+    def __init__(self, per_call_cost=0.0, per_message_cost=0.0):
+        self.per_call_cost = per_call_cost
+        self.per_message_cost = per_message_cost
+        self.calls = 0
+        self.sent = 0
+        self.outbox = []
+
+    def send_batch(self, messages):
+        delay = self.per_call_cost + self.per_message_cost * len(messages)
+        if delay:
+            time.sleep(delay)
+        self.calls += 1
+        self.sent += len(messages)
+        self.outbox.extend(messages)
+
+
+class FakeSmtpSink(FakeSinkBase):
+    pass
+
+
+class FakeSmsSink(FakeSinkBase):
+    pass
+
+
+class NotificationChannel:
+    def __init__(self, sink, max_batch=500, flush_interval=0.05, coalesce_window=60.0,
+                 clock=time.monotonic):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.coalesce_window = coalesce_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        # held for a whole flush, so batches reach the sink one at a time and in order
+        self._flush_lock = threading.Lock()
+        self._buffer = []
+        self._oldest = None
+        self._last_seen = {}
+        # publish() and flush() drop expired coalescing keys once per window
+        self._next_expire = clock() + coalesce_window
+        self._flusher = None
+        self._stopped = threading.Event()
+
+        # counters for monitoring / benchmarks
+        self.published = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.send_errors = 0
+        self.max_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+    def publish(self, recipient, item, text):
+        now = self._clock()
+        with self._lock:
+            if now >= self._next_expire:
+                self._expire_locked(now)
+            key = (recipient, item)
+            last = self._last_seen.get(key)
+            if last is not None and now - last < self.coalesce_window:
+                self.coalesced += 1
+                return False
+            self._last_seen[key] = now
+            self.published += 1
+            if not self._buffer:
+                self._oldest = now
+            self._buffer.append((recipient, text))
+            ready = (len(self._buffer) >= self.max_batch
+                     or now - self._oldest >= self.flush_interval)
+        if ready:
+            self._try_flush()
+        return True
+
+    # If the sink raises, the unsent messages go back to the front of the buffer for the next
+    # flush (their keys are still in _last_seen, so a re-publish would be coalesced away)
+    def flush(self):
+        with self._flush_lock:
+            now = self._clock()
+            with self._lock:
+                if now >= self._next_expire:
+                    self._expire_locked(now)
+                if not self._buffer:
+                    return 0
+                batch, self._buffer = self._buffer, []
+                oldest, self._oldest = self._oldest, None
+            # send outside the buffer lock so publishers keep buffering while the gateway is busy
+            sent = 0
+            try:
+                while sent < len(batch):
+                    self.sink.send_batch(batch[sent:sent + self.max_batch])
+                    sent += self.max_batch
+            except Exception:
+                with self._lock:
+                    self._buffer[:0] = batch[sent:]
+                    self._oldest = oldest
+                    self.send_errors += 1
+                raise
+            latency = self._clock() - oldest
+            with self._lock:
+                self.flushes += 1
+                self.total_flush_latency += latency
+                self.max_flush_latency = max(self.max_flush_latency, latency)
+            return len(batch)
+
+    # Forget coalescing keys older than the window so _last_seen does not grow forever
+    def expire(self):
+        now = self._clock()
+        with self._lock:
+            self._expire_locked(now)
+
+    def _expire_locked(self, now):
+        self._last_seen = {key: seen for key, seen in self._last_seen.items()
+                           if now - seen < self.coalesce_window}
+        self._next_expire = now + self.coalesce_window
+
+    # Background thread that flushes on time even when nobody publishes
+    def start(self):
+        if self._flusher is None:
+            self._stopped.clear()
+            self._flusher = threading.Thread(target=self._run, daemon=True)
+            self._flusher.start()
+
+    # For publish() and the background flusher: a failed batch is already requeued and counted
+    # in send_errors, the next flush retries it
+    def _try_flush(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            self._try_flush()
+
+    def stop(self):
+        if self._flusher is not None:
+            self._stopped.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+
+class BatchedEmailAlertObserver(NotificationAlertObserver):
+    def __init__(self, email, observable: IphoneObservable, channel, item="iphone"):
+        self.observable = observable
+        self.email = email
+        self.channel = channel
+        self.item = item
+
+    # Queue the mail instead of sending it
+    def update(self):
+        self.channel.publish(self.email, self.item, f"{self.item} is back in stock")
+
+
+class BatchedMobileAlertObserver(NotificationAlertObserver):
+    def __init__(self, userName, observable: IphoneObservable, channel, item="iphone"):
+        self.observable = observable
+        self.userName = userName
+        self.channel = channel
+        self.item = item
+
+    # Queue the msg instead of sending it
+    def update(self):
+        self.channel.publish(self.userName, self.item, f"{self.item} is back in stock")
+
+
+def benchmark(subscribers=50_000, per_call_cost=0.0001):
+    for max_batch in (1, 100, 1000):
+        sink = FakeSmtpSink(per_call_cost=per_call_cost)
+        channel = NotificationChannel(sink, max_batch=max_batch, flush_interval=1.0)
+        start = time.perf_counter()
+        for i in range(subscribers):
+            channel.publish(f"user{i}@email.com", "iphone", "iphone is back in stock")
+        channel.flush()
+        elapsed = time.perf_counter() - start
+        print(f"max_batch={max_batch:5}: {sink.sent / elapsed:10.0f} msg/s, "
+              f"{sink.calls} gateway calls, "
+              f"max flush latency {channel.max_flush_latency * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    email_channel = NotificationChannel(FakeSmtpSink(), max_batch=2)
+    sms_channel = NotificationChannel(FakeSmsSink(), max_batch=2)
+
+    iphonStockObservable = IphoneObservable()
+
+    observer1 = BatchedEmailAlertObserver('keshav@email.com', iphonStockObservable, email_channel)
+    observer2 = BatchedEmailAlertObserver('vikas@email.com', iphonStockObservable, email_channel)
+    observer3 = BatchedMobileAlertObserver('Keshav', iphonStockObservable, sms_channel)
+
+    iphonStockObservable.add(observer1)
+    iphonStockObservable.add(observer2)
+    iphonStockObservable.add(observer3)
+
+    iphonStockObservable.setStockCount(11)
+    iphonStockObservable.setStockCount(-11)
+    # restocked again inside the coalescing window, nobody is messaged twice
+    iphonStockObservable.setStockCount(11)
+    email_channel.flush()
+    sms_channel.flush()
+
+    print("Mails sent:", email_channel.sink.outbox)
+    print("Messages sent:", sms_channel.sink.outbox)
+    print("Coalesced:", email_channel.coalesced + sms_channel.coalesced)
+
+    benchmark()
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from ObserverRegistry import ObserverRegistry
+
 
 class Subject(ABC):
     @abstractmethod
@@ -19,13 +21,13 @@ class Item(Subject):
     def __init__(self, name, stock):
         self.name = name
         self.stock = stock
-        self._observers = set()
+        self._observers = ObserverRegistry()
 
     def attach(self, observer):
         self._observers.add(observer)
 
     def detach(self, observer):
-        self._observers.discard(observer)
+        self._observers.remove(observer)
 
     def notify_observers(self):
         for observer in self._observers:
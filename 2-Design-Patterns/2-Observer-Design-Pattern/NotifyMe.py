@@ -1,15 +1,18 @@
 # low-level design Python code for notifying all users who have asked to be notified when items come into stock:
+from ObserverRegistry import ObserverRegistry
+
+
 class Item:
     def __init__(self, name, stock):
         self.name = name
         self.stock = stock
-        self._observers = set()
+        self._observers = ObserverRegistry()
 
     def attach(self, observer):
         self._observers.add(observer)
 
     def detach(self, observer):
-        self._observers.discard(observer)
+        self._observers.remove(observer)
 
     def notify_observers(self):
         for observer in self._observers:
@@ -0,0 +1,88 @@
+'''
+Per-instance observer registry holding weak references.
+
+    - add / remove are O(1) dict operations (keyed by id of the observer)
+    - iteration is in subscription order
+    - an observer that is garbage collected drops out of the registry on its own, so a
+      forgotten remove() can not keep observers (and everything they reference) alive
+
+Because the references are weak, the caller has to keep its own reference to every observer
+it wants to keep notified.
+'''
+import gc
+import os
+import weakref
+
+
+class ObserverRegistry:
+    def __init__(self):
+        self._refs = {}
+
+    def add(self, observer):
+        key = id(observer)
+        if key in self._refs:
+            return
+        refs = self._refs
+
+        # Only touches the dict, a reference back to the registry would keep it alive
+        def prune(ref, key=key):
+            if refs.get(key) is ref:
+                del refs[key]
+
+        refs[key] = weakref.ref(observer, prune)
+
+    def remove(self, observer):
+        self._refs.pop(id(observer), None)
+
+    def __contains__(self, observer):
+        ref = self._refs.get(id(observer))
+        return ref is not None and ref() is observer
+
+    def __len__(self):
+        return len(self._refs)
+
+    # Iterate over a snapshot, so observers may add/remove while being notified
+    def __iter__(self):
+        for ref in list(self._refs.values()):
+            observer = ref()
+            if observer is not None:
+                yield observer
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        # peak instead of current RSS, still enough to spot unbounded growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _Observer:
+    def update(self):
+        pass
+
+
+def benchmark(cycles=2_000_000, report_every=250_000):
+    registry = ObserverRegistry()
+    keep = [_Observer() for _ in range(100)]
+    for observer in keep:
+        registry.add(observer)
+
+    gc.collect()
+    print(f"start: {current_rss_kb()} KB, {len(registry)} observers")
+    for i in range(1, cycles + 1):
+        observer = _Observer()
+        registry.add(observer)
+        # every other observer is removed explicitly, the rest are just dropped
+        if i % 2:
+            registry.remove(observer)
+        del observer
+        if i % report_every == 0:
+            print(f"{i:>9} cycles: {current_rss_kb()} KB, {len(registry)} observers")
+
+
+if __name__ == "__main__":
+    benchmark()
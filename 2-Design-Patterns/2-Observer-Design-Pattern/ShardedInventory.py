@@ -0,0 +1,362 @@
+'''
+Sharded inventory for back-in-stock notifications at flash-sale scale.
+
+Notify.py keeps every Item in one dict and each Item loops over its own set of observers on the
+caller's thread. Here the items are split over N shards (picked by hash of the item name), each
+shard has its own lock, and subscriptions live in a reverse index:
+
+    item -> compact array of user ids      (what we walk on restock)
+    user -> set of item names              (what we walk on unsubscribe-all)
+
+When a stock update crosses the 0 -> positive edge the shard only snapshots the user-id array and
+hands a FanOutBatch to a dispatcher. The actual observer.update() calls happen on the dispatcher
+worker threads, so update_item_stock() returns in time independent of the number of waiters.
+'''
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import namedtuple
+
+
+# Read-only view of an item handed to observers (same fields Notify.Item exposes)
+ItemView = namedtuple("ItemView", ["name", "stock"])
+
+
+class Observer(ABC):
+    @abstractmethod
+    def update(self, subject):
+        pass
+
+
+class User(Observer):
+    def __init__(self, name, email):
+        self.name = name
+        self.email = email
+
+    def update(self, subject):
+        print(f"Dear {self.name}, the item {subject.name} is now in stock.")
+
+
+# A restock that still has to be delivered to user_ids
+class FanOutBatch:
+    def __init__(self, item_name, stock, user_ids):
+        self.item_name = item_name
+        self.stock = stock
+        self.user_ids = user_ids
+
+    def __len__(self):
+        return len(self.user_ids)
+
+
+# Maps observers to small integer ids so subscriptions can be stored as array('q'). A released id
+# is never handed out again: a batch cut before the release may still hold it.
+class UserDirectory:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._users = []
+
+    def id_for(self, user):
+        user_id = self._ids.get(user)
+        if user_id is not None:
+            return user_id
+        with self._lock:
+            user_id = self._ids.get(user)
+            if user_id is None:
+                user_id = len(self._users)
+                self._users.append(user)
+                self._ids[user] = user_id
+        return user_id
+
+    # None for a user that never subscribed or has been released
+    def find(self, user):
+        return self._ids.get(user)
+
+    # Drop a user that has no subscriptions left, so the directory does not keep it alive
+    def release(self, user_id):
+        with self._lock:
+            user = self._users[user_id]
+            if user is not None:
+                del self._ids[user]
+                self._users[user_id] = None
+
+    # None once the user has been released
+    def lookup(self, user_id):
+        return self._users[user_id]
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class InventoryShard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stock = {}
+        self.subscribers = {}
+        # ids unsubscribed since the last compaction, removed lazily from the arrays
+        self.removed = {}
+
+    def compact(self, item_name):
+        removed = self.removed.pop(item_name, None)
+        ids = self.subscribers[item_name]
+        if removed:
+            ids = array("q", (user_id for user_id in ids if user_id not in removed))
+            self.subscribers[item_name] = ids
+        return ids
+
+
+class FanOutDispatcher:
+    '''
+    Delivers FanOutBatch objects on background worker threads.
+    Big batches are cut into chunks so several workers can share one hot item.
+    '''
+
+    def __init__(self, directory, workers=4, chunk_size=1024):
+        self._directory = directory
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue()
+        self.delivered = 0
+        # update() calls that raised; one bad observer must not stop the others or the worker
+        self.failed = 0
+        self._count_lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, batch):
+        view = ItemView(batch.item_name, batch.stock)
+        ids = batch.user_ids
+        for start in range(0, len(ids), self._chunk_size):
+            self._queue.put((view, ids[start:start + self._chunk_size]))
+
+    def _run(self):
+        lookup = self._directory.lookup
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self._queue.task_done()
+                return
+            try:
+                view, ids = task
+                delivered = failed = 0
+                for user_id in ids:
+                    user = lookup(user_id)
+                    if user is None:
+                        # unsubscribed from everything after the batch was cut
+                        continue
+                    try:
+                        user.update(view)
+                        delivered += 1
+                    except Exception:
+                        failed += 1
+                with self._count_lock:
+                    self.delivered += delivered
+                    self.failed += failed
+            finally:
+                self._queue.task_done()
+
+    # Block until every submitted batch has been delivered
+    def join(self):
+        self._queue.join()
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+# Delivers on the caller's thread, same behaviour as Item.notify_observers
+class InlineDispatcher:
+    def __init__(self, directory):
+        self._directory = directory
+        self.delivered = 0
+
+    def submit(self, batch):
+        view = ItemView(batch.item_name, batch.stock)
+        for user_id in batch.user_ids:
+            user = self._directory.lookup(user_id)
+            if user is not None:
+                user.update(view)
+                self.delivered += 1
+
+    def join(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ShardedInventory:
+    def __init__(self, num_shards=64, dispatcher=None):
+        self._shards = [InventoryShard() for _ in range(num_shards)]
+        self._num_shards = num_shards
+        self.directory = UserDirectory()
+        self.dispatcher = dispatcher or FanOutDispatcher(self.directory)
+        # user id -> item names, guarded by its own lock since it spans shards
+        self._user_items = {}
+        self._user_items_lock = threading.Lock()
+
+    def _shard(self, item_name):
+        return self._shards[hash(item_name) % self._num_shards]
+
+    def add_item(self, item_name, stock=0):
+        shard = self._shard(item_name)
+        with shard.lock:
+            shard.stock[item_name] = stock
+            shard.subscribers.setdefault(item_name, array("q"))
+
+    def remove_item(self, item_name):
+        shard = self._shard(item_name)
+        # _user_items is updated under the shard lock too, so a concurrent register_user for
+        # this item either sees the item gone or is undone here
+        with shard.lock:
+            del shard.stock[item_name]
+            ids = shard.compact(item_name)
+            del shard.subscribers[item_name]
+            with self._user_items_lock:
+                for user_id in ids:
+                    self._forget_locked(user_id, item_name)
+
+    # Drop one subscription from the reverse index, and the user once nothing is left.
+    # Caller holds _user_items_lock.
+    def _forget_locked(self, user_id, item_name):
+        items = self._user_items.get(user_id)
+        if items is None:
+            return
+        items.discard(item_name)
+        if not items:
+            del self._user_items[user_id]
+            self.directory.release(user_id)
+
+    def get_stock(self, item_name):
+        return self._shard(item_name).stock.get(item_name)
+
+    def update_item_stock(self, item_name, new_stock):
+        '''
+        Returns the FanOutBatch handed to the dispatcher on a 0 -> positive edge, else None.
+        '''
+        shard = self._shard(item_name)
+        with shard.lock:
+            old_stock = shard.stock.get(item_name)
+            if old_stock is None:
+                print(f"Item {item_name} not found in inventory.")
+                return None
+            shard.stock[item_name] = new_stock
+            if not (old_stock == 0 and new_stock > 0):
+                return None
+            # copying an array('q') is a single memcpy, cheap enough to do under the lock
+            batch = FanOutBatch(item_name, new_stock, array("q", shard.compact(item_name)))
+        if batch.user_ids:
+            self.dispatcher.submit(batch)
+        return batch
+
+    def register_user(self, item_name, user):
+        shard = self._shard(item_name)
+        with shard.lock:
+            if item_name not in shard.stock:
+                print(f"Item {item_name} not found in inventory.")
+                return
+            with self._user_items_lock:
+                # ids are released under this lock, so the id stays valid while it is held
+                user_id = self.directory.id_for(user)
+                items = self._user_items.setdefault(user_id, set())
+                if item_name in items:
+                    return
+                items.add(item_name)
+            removed = shard.removed.get(item_name)
+            if removed and user_id in removed:
+                # still physically present in the array, just revive it
+                removed.discard(user_id)
+            else:
+                shard.subscribers[item_name].append(user_id)
+
+    def unregister_user(self, item_name, user):
+        shard = self._shard(item_name)
+        # same lock order as register_user, so both updates are seen together
+        with shard.lock:
+            with self._user_items_lock:
+                user_id = self.directory.find(user)
+                items = self._user_items.get(user_id)
+                if not items or item_name not in items:
+                    return
+                self._forget_locked(user_id, item_name)
+            if item_name in shard.subscribers:
+                shard.removed.setdefault(item_name, set()).add(user_id)
+
+    def unregister_all(self, user):
+        for item_name in self.items_for_user(user):
+            self.unregister_user(item_name, user)
+
+    def items_for_user(self, user):
+        with self._user_items_lock:
+            return set(self._user_items.get(self.directory.find(user), ()))
+
+    def subscriber_count(self, item_name):
+        shard = self._shard(item_name)
+        with shard.lock:
+            return len(shard.compact(item_name))
+
+    def close(self):
+        self.dispatcher.join()
+        self.dispatcher.close()
+
+
+# Observer that only counts, so the benchmark measures the engine and not print()
+class CountingUser(Observer):
+    def __init__(self, name):
+        self.name = name
+        self.received = 0
+
+    def update(self, subject):
+        self.received += 1
+
+
+def benchmark(num_items=200_000, waitlist=50_000):
+    inventory = ShardedInventory(num_shards=64)
+    for i in range(num_items):
+        inventory.add_item(f"sku-{i}", 0)
+
+    users = [CountingUser(f"user-{i}") for i in range(waitlist)]
+    for user in users:
+        inventory.register_user("sku-42", user)
+
+    start = time.perf_counter()
+    batch = inventory.update_item_stock("sku-42", 10)
+    handoff = time.perf_counter() - start
+    inventory.dispatcher.join()
+    total = time.perf_counter() - start
+
+    print(f"{num_items} items, {len(batch)} waitlisted users on one SKU")
+    print(f"update_item_stock returned in {handoff * 1000:.2f} ms")
+    print(f"fan-out delivered {inventory.dispatcher.delivered} notifications in {total * 1000:.2f} ms")
+    inventory.close()
+
+
+if __name__ == "__main__":
+    inventory = ShardedInventory(num_shards=8)
+
+    inventory.add_item("item1", 0)
+    inventory.add_item("item2", 0)
+
+    user1 = User("user1", "user1@example.com")
+    user2 = User("user2", "user2@example.com")
+    inventory.register_user("item1", user1)
+    inventory.register_user("item2", user1)
+    inventory.register_user("item2", user2)
+    print("user1 waits for", sorted(inventory.items_for_user(user1)))
+
+    inventory.update_item_stock("item1", 1)
+    inventory.update_item_stock("item5", 2)
+    inventory.update_item_stock("item2", 3)
+    inventory.dispatcher.join()
+
+    inventory.unregister_user("item1", user1)
+    inventory.update_item_stock("item1", 0)
+    inventory.update_item_stock("item1", 5)
+    inventory.close()
+
+    benchmark()
@@ -0,0 +1,263 @@
+'''
+WeatherStationObservable for high-frequency sensor streams.
+
+Examp1.WeatherStationObservable notifies on every distinct value, at 1 kHz that is up to a
+thousand renders per second on every display. ThrottledWeatherStationObservable asks a
+NotifyPolicy which of the changed readings are worth publishing:
+
+    Deadband(threshold)  only when |temp - last published temp| > threshold
+    Throttle(interval)   at most once every `interval` seconds (leading edge)
+    Debounce(quiet)      only once the reading has not changed for `quiet` seconds
+
+setTemp() feeds one reading at a time. setTemps() takes a whole NumPy array of readings and
+lets the policy pick the readings to publish with array operations, so only the published
+readings cost a Python-level notify(). Both paths publish exactly the same values.
+'''
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from Examp1 import MobileDisplayObserver, Observer, TvDisplayObserver, WeatherStationObservable
+
+
+# Policy Interface
+class NotifyPolicy(ABC):
+    # Single reading, returns the list of values to publish now
+    @abstractmethod
+    def offer(self, timestamp, value):
+        pass
+
+    # Sorted arrays of changed readings, returns the array of values to publish
+    @abstractmethod
+    def select(self, timestamps, values):
+        pass
+
+    # Time has passed without a change (reading repeated at `timestamp`), returns the values
+    # to publish now
+    def tick(self, timestamp):
+        return []
+
+    # Values still held back by the policy
+    def flush(self):
+        return []
+
+
+class EveryChange(NotifyPolicy):
+    def offer(self, timestamp, value):
+        return [value]
+
+    def select(self, timestamps, values):
+        return values
+
+
+class Deadband(NotifyPolicy):
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self._last = None
+
+    def offer(self, timestamp, value):
+        if self._last is None or abs(value - self._last) > self.threshold:
+            self._last = value
+            return [value]
+        return []
+
+    def select(self, timestamps, values):
+        published = []
+        i, n = 0, len(values)
+        if self._last is None and n:
+            self._last = values[0]
+            published.append(values[0])
+            i = 1
+        # Look for the next reading outside the band in growing windows,
+        # one vectorised scan per published value
+        window = 1024
+        while i < n:
+            chunk = values[i:i + window]
+            hits = np.flatnonzero(np.abs(chunk - self._last) > self.threshold)
+            if hits.size == 0:
+                i += len(chunk)
+                window = min(window * 2, 1 << 20)
+                continue
+            j = i + hits[0]
+            self._last = values[j]
+            published.append(values[j])
+            i = j + 1
+            window = 1024
+        return np.array(published, dtype=values.dtype)
+
+
+class Throttle(NotifyPolicy):
+    def __init__(self, interval):
+        self.interval = interval
+        self._next_allowed = -np.inf
+
+    def offer(self, timestamp, value):
+        if timestamp >= self._next_allowed:
+            self._next_allowed = timestamp + self.interval
+            return [value]
+        return []
+
+    def select(self, timestamps, values):
+        picked = []
+        i = np.searchsorted(timestamps, self._next_allowed)
+        while i < len(timestamps):
+            picked.append(i)
+            self._next_allowed = timestamps[i] + self.interval
+            i = np.searchsorted(timestamps, self._next_allowed)
+        return values[np.array(picked, dtype=np.intp)]
+
+
+class Debounce(NotifyPolicy):
+    def __init__(self, quiet):
+        self.quiet = quiet
+        self._pending = None
+
+    def offer(self, timestamp, value):
+        published = []
+        if self._pending is not None and timestamp - self._pending[0] >= self.quiet:
+            published.append(self._pending[1])
+        self._pending = (timestamp, value)
+        return published
+
+    def select(self, timestamps, values):
+        if not len(values):
+            return values
+        if self._pending is not None:
+            timestamps = np.concatenate(([self._pending[0]], timestamps))
+            values = np.concatenate(([self._pending[1]], values))
+        # a reading survives when the next change comes at least `quiet` later
+        settled = np.diff(timestamps) >= self.quiet
+        self._pending = (timestamps[-1], values[-1])
+        return values[:-1][settled]
+
+    # A pending reading that stayed unchanged for `quiet` seconds has settled
+    def tick(self, timestamp):
+        if self._pending is not None and timestamp - self._pending[0] >= self.quiet:
+            pending, self._pending = self._pending, None
+            return [pending[1]]
+        return []
+
+    def flush(self):
+        pending, self._pending = self._pending, None
+        return [] if pending is None else [pending[1]]
+
+
+class ThrottledWeatherStationObservable(WeatherStationObservable):
+    def __init__(self, policy=None, clock=time.monotonic):
+        super().__init__()
+        self.policy = policy or EveryChange()
+        self._clock = clock
+        # last raw reading, getTemp() returns the last published one
+        self._reading = None
+        self.published = 0
+
+    def _publish(self, values):
+        for value in values:
+            if value == self._temp:
+                continue
+            self._temp = value
+            self.published += 1
+            self.notify()
+
+    def setTemp(self, new_temperature, timestamp=None):
+        if timestamp is None:
+            timestamp = self._clock()
+        if self._reading == new_temperature:
+            # no change, but time went on: a debounced reading may have settled
+            self._publish(self.policy.tick(timestamp))
+            return
+        self._reading = new_temperature
+        self._publish(self.policy.offer(timestamp, new_temperature))
+
+    def setTemps(self, readings, timestamps=None, rate_hz=1000.0):
+        '''
+        Ingest a batch of readings. Without timestamps the readings are taken to be sampled
+        at rate_hz starting now. Returns the number of notifications sent.
+        '''
+        readings = np.asarray(readings, dtype=np.float64)
+        if not readings.size:
+            return 0
+        if timestamps is None:
+            timestamps = self._clock() + np.arange(readings.size) / rate_hz
+        else:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+
+        changed = np.empty(readings.size, dtype=bool)
+        changed[0] = readings[0] != self._reading
+        np.not_equal(readings[1:], readings[:-1], out=changed[1:])
+        self._reading = readings[-1]
+
+        before = self.published
+        self._publish(self.policy.select(timestamps[changed], readings[changed]).tolist())
+        # the unchanged readings after the last change still tell the policy how much time passed
+        self._publish(self.policy.tick(timestamps[-1]))
+        return self.published - before
+
+    # Publish whatever the policy still holds back (end of a replay)
+    def flush(self):
+        before = self.published
+        self._publish(self.policy.flush())
+        return self.published - before
+
+
+class CountingDisplayObserver(Observer):
+    def __init__(self, observable):
+        self.observable = observable
+        self.renders = 0
+
+    def update(self):
+        self.renders += 1
+
+
+def sensor_stream(seconds=3600, rate_hz=1000, seed=7):
+    rng = np.random.default_rng(seed)
+    readings = 20 + np.cumsum(rng.normal(0, 0.01, int(seconds * rate_hz)))
+    return np.round(readings, 2), np.arange(int(seconds * rate_hz)) / rate_hz
+
+
+def benchmark(seconds=3600, rate_hz=1000):
+    readings, timestamps = sensor_stream(seconds, rate_hz)
+    print(f"replaying {readings.size} readings ({seconds} s at {rate_hz} Hz)")
+    policies = [
+        ("every change", EveryChange),
+        ("deadband 0.5", lambda: Deadband(0.5)),
+        ("throttle 1 s", lambda: Throttle(1.0)),
+        ("debounce 50 ms", lambda: Debounce(0.05)),
+    ]
+    for name, make_policy in policies:
+        station = ThrottledWeatherStationObservable(make_policy())
+        display = CountingDisplayObserver(station)
+        station.add(display)
+        start = time.perf_counter()
+        station.setTemps(readings, timestamps)
+        station.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{name:15}: {display.renders:8} renders, "
+              f"{readings.size / elapsed / 1e6:6.1f} M readings/s")
+
+    # scalar path on a slice, must publish the same values
+    sample = 200_000
+    for make_policy in (lambda: Deadband(0.5), lambda: Debounce(0.05)):
+        batch = ThrottledWeatherStationObservable(make_policy())
+        batch.setTemps(readings[:sample], timestamps[:sample])
+        scalar = ThrottledWeatherStationObservable(make_policy())
+        start = time.perf_counter()
+        for t, value in zip(timestamps[:sample].tolist(), readings[:sample].tolist()):
+            scalar.setTemp(value, t)
+        elapsed = time.perf_counter() - start
+        assert scalar.published == batch.published and scalar.getTemp() == batch.getTemp()
+    print(f"setTemp loop    : {sample / elapsed / 1e6:6.1f} M readings/s")
+
+
+if __name__ == "__main__":
+    observable = ThrottledWeatherStationObservable(Deadband(0.5))
+    observer_1 = MobileDisplayObserver(observable)
+    observable.add(observer_1)
+    observer_2 = TvDisplayObserver(observable)
+    observable.add(observer_2)
+
+    # only 10 -> 11 -> 12.5 are far enough apart to render
+    observable.setTemps([10, 10.2, 10.4, 11, 11.3, 12.5])
+
+    benchmark()
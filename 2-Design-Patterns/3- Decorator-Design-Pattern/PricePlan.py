@@ -0,0 +1,271 @@
+'''
+Flattened price evaluation for decorated pizzas.
+
+Mushroom(ExtraCheese(Margherita())).cost() makes one nested Python call per topping layer on
+every price query, and a long enough chain hits the recursion limit. This module turns a chain
+into a PricePlan instead:
+
+    base price + [price of every topping, outermost first]
+
+The chain is walked with a loop through .basePizza, never recursively. The price a topping adds
+is measured once per topping class by calling its cost() on top of a zero-priced pizza.
+Pizzas and toppings whose price can change at runtime (MenuPricing.py) define price_token();
+a measured price is only reused while the token is unchanged.
+
+FlatPizza keeps the plan of one pizza and caches its total; add_topping() / remove_topping()
+change the plan and drop the cached total. price_orders() prices many orders in one pass and
+keeps each order's total on it, so pricing the same orders again skips the chains.
+
+On CPython 3.11 Python-to-Python calls are inlined, so no loop over a chain beats the recursive
+cost() the first time: the first price_orders() pass is about 1.2-1.7x slower than cost(). The
+gain is on repeated queries (20k orders: ~8 ms against ~55 ms) and on chains deeper than the
+recursion limit.
+'''
+import copy
+import time
+
+from Examp1 import BasePizza, ExtraCheese, Farmhouse, Margherita, Mushroom, ToppingDecorator, VegDelight
+
+
+class _ZeroPizza(BasePizza):
+    def cost(self):
+        return 0
+
+
+_ZERO = _ZeroPizza()
+# topping class -> (price, token the price was measured with)
+_topping_prices = {}
+# topping class -> price, for toppings without a price_token; lets the chain walks skip the
+# token check
+_fixed_prices = {}
+# base pizza classes without a price_token, seen by chain_total
+_fixed_bases = set()
+
+
+# None for fixed prices, else a value that changes whenever the price may have changed
+def price_token(pizza):
+    token = getattr(pizza, "price_token", None)
+    return None if token is None else token()
+
+
+# Price the topping class adds on top of its base, measured once per class and token
+def topping_price(topping):
+    cls = type(topping)
+    token = price_token(topping)
+    entry = _topping_prices.get(cls)
+    if entry is None or entry[1] != token:
+        probe = copy.copy(topping)
+        probe.basePizza = _ZERO
+        entry = _topping_prices[cls] = (probe.cost(), token)
+        if token is None:
+            _fixed_prices[cls] = entry[0]
+    return entry[0]
+
+
+# token -> part priced with it; True while every part still has the token
+def sources_current(sources):
+    return all(part.price_token() == token for token, part in sources.items())
+
+
+# Split a decorator chain into its base pizza and the toppings, outermost first
+def unwrap(pizza):
+    toppings = []
+    while isinstance(pizza, ToppingDecorator):
+        toppings.append(pizza)
+        pizza = pizza.basePizza
+    return pizza, toppings
+
+
+class PricePlan:
+    def __init__(self, base_price, additions, sources=None):
+        self.base_price = base_price
+        self.additions = additions
+        self.total = base_price + sum(additions)
+        # token -> one part priced with it, to tell whether the plan is still current
+        self.sources = sources or {}
+
+    @classmethod
+    def compile(cls, pizza, fixed=_fixed_prices):
+        sources = {}
+        additions = []
+        while True:
+            # known fixed-price toppings skip the isinstance check, which is slow on an ABC
+            price = fixed.get(type(pizza))
+            if price is None:
+                if not isinstance(pizza, ToppingDecorator):
+                    break
+                token = price_token(pizza)
+                if token is not None:
+                    sources.setdefault(token, pizza)
+                price = topping_price(pizza)
+            additions.append(price)
+            pizza = pizza.basePizza
+        base = pizza
+        token = price_token(base)
+        if token is not None:
+            sources.setdefault(token, base)
+        return cls(base.cost(), additions, sources)
+
+    def is_current(self):
+        # plain Examp1 pizzas have fixed prices, nothing to check
+        if not self.sources:
+            return True
+        return sources_current(self.sources)
+
+
+class FlatPizza(BasePizza):
+    def __init__(self, pizza):
+        base, toppings = unwrap(pizza)
+        self.base = base
+        # innermost first, the order toppings were put on
+        self.toppings = [type(topping) for topping in reversed(toppings)]
+        self._plan = None
+
+    def add_topping(self, topping_cls):
+        self.toppings.append(topping_cls)
+        self._plan = None
+        return self
+
+    def remove_topping(self, topping_cls):
+        self.toppings.remove(topping_cls)
+        self._plan = None
+        return self
+
+    def plan(self):
+        plan = self._plan
+        if plan is None or (plan.sources and not plan.is_current()):
+            plan = self._plan = PricePlan.compile(self.to_chain())
+        return plan
+
+    def cost(self):
+        # cached fixed-price total without a call into plan()
+        plan = self._plan
+        if plan is not None and not plan.sources:
+            return plan.total
+        return self.plan().total
+
+    # Rebuild the ordinary decorator chain
+    def to_chain(self):
+        pizza = self.base
+        for topping_cls in self.toppings:
+            pizza = topping_cls(pizza)
+        return pizza
+
+
+# Total of a decorator chain and the token sources it depends on (None for fixed prices),
+# walked with a loop and without building a PricePlan
+def chain_total(pizza, fixed=_fixed_prices, fixed_bases=_fixed_bases):
+    total = 0
+    sources = None
+    while True:
+        # tight inner loop over the fixed-price toppings, the common case
+        price = fixed.get(type(pizza))
+        while price is not None:
+            total += price
+            pizza = pizza.basePizza
+            price = fixed.get(type(pizza))
+        cls = type(pizza)
+        # the ABC isinstance check and a missing price_token cost about 1 us each
+        if cls in fixed_bases:
+            return total + pizza.cost(), sources
+        if not isinstance(pizza, ToppingDecorator):
+            break
+        token = price_token(pizza)
+        if token is not None:
+            sources = sources or {}
+            sources.setdefault(token, pizza)
+        total += topping_price(pizza)
+        pizza = pizza.basePizza
+    token = price_token(pizza)
+    if token is None:
+        fixed_bases.add(cls)
+    else:
+        sources = sources or {}
+        sources.setdefault(token, pizza)
+    return total + pizza.cost(), sources
+
+
+def price_orders(orders):
+    '''
+    Price an iterable of pizzas (decorator chains or FlatPizza) and return the list of totals.
+    Each chain is walked once, with a loop, so depth is not limited by the recursion limit. The
+    total is kept on the order (like MenuPricing.signature(), a chain is not re-wrapped after it
+    is priced), so pricing the same orders again costs one lookup per order. The first pass is
+    somewhat slower than the recursive cost() (see benchmark()).
+    '''
+    totals = []
+    for pizza in orders:
+        entry = pizza.__dict__.get("_order_price")
+        if entry is None or (entry[1] is not None and not sources_current(entry[1])):
+            if isinstance(pizza, FlatPizza):
+                totals.append(pizza.cost())
+                continue
+            entry = pizza._order_price = chain_total(pizza)
+        totals.append(entry[0])
+    return totals
+
+
+def random_orders(count, max_toppings=40, seed=3):
+    import random
+
+    rng = random.Random(seed)
+    bases = [Margherita, Farmhouse, VegDelight]
+    toppings = [ExtraCheese, Mushroom]
+    orders = []
+    for _ in range(count):
+        pizza = rng.choice(bases)()
+        for _ in range(rng.randint(0, max_toppings)):
+            pizza = rng.choice(toppings)(pizza)
+        orders.append(pizza)
+    return orders
+
+
+def benchmark(count=20_000):
+    orders = random_orders(count)
+
+    start = time.perf_counter()
+    expected = [pizza.cost() for pizza in orders]
+    recursive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    totals = price_orders(orders)
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    again = price_orders(orders)
+    bulk_again = time.perf_counter() - start
+
+    start = time.perf_counter()
+    [pizza.cost() for pizza in orders]
+    recursive_again = time.perf_counter() - start
+
+    flat = [FlatPizza(pizza) for pizza in orders]
+    for pizza in flat:
+        pizza.cost()
+    start = time.perf_counter()
+    cached = [pizza.cost() for pizza in flat]
+    repeat = time.perf_counter() - start
+
+    assert totals == expected == cached == again
+    print(f"{count} orders with up to 40 toppings")
+    print(f"recursive cost()          : {recursive * 1000:7.1f} ms, again {recursive_again * 1000:7.1f} ms")
+    print(f"price_orders() first pass : {bulk * 1000:7.1f} ms, again {bulk_again * 1000:7.1f} ms")
+    print(f"FlatPizza cached cost     : {repeat * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    pizza_1 = Mushroom(ExtraCheese(Margherita()))
+    plan = PricePlan.compile(pizza_1)
+    print(f"pizza_1: base {plan.base_price} + {plan.additions} = {plan.total}")
+
+    flat = FlatPizza(pizza_1)
+    flat.add_topping(Mushroom)
+    print(f"pizza_1 with more mushroom: {flat.cost()}")
+
+    # far deeper than the recursion limit allows for cost()
+    deep = Margherita()
+    for _ in range(5000):
+        deep = ExtraCheese(deep)
+    print(f"5000 x extra cheese: {PricePlan.compile(deep).total}")
+
+    benchmark()
@@ -0,0 +1,205 @@
+'''
+Registry based Factory.
+
+ShapeFactory.getShape in 0-FactoryPattern.py (and the factories in 1-AbstractFactoryPattern.py)
+walk an if/elif chain and call input.lower() once per branch, so a lookup gets slower with every
+product added and the factory has to be edited for every new product.
+
+Here each product class registers itself with a decorator:
+
+    @shape_registry.register("circle", shared=True)
+    class Circle(Shape): ...
+
+and the factory is a single dict lookup. The case normalisation of a key is done once: the raw
+key the caller used is remembered next to the normalised one, so "CIRCLE", "Circle" and "circle"
+each pay for .lower() only the first time.
+
+Products registered with shared=True are stateless, so the registry hands out one flyweight
+instance instead of building a new object on every call.
+'''
+import random
+import time
+from abc import ABC, abstractmethod
+
+
+class FactoryRegistry:
+    # Only raw keys that resolved to a product are remembered, so junk input can not grow it
+    MAX_ALIASES = 4096
+
+    def __init__(self):
+        self._products = {}
+        self._aliases = {}
+        self._shared = {}
+
+    def register(self, key=None, shared=False):
+        def decorator(cls):
+            name = (key or cls.__name__).lower()
+            if name in self._products:
+                raise ValueError(f"{name!r} is already registered")
+            self._products[name] = (cls, shared)
+            self._aliases.clear()
+            return cls
+        return decorator
+
+    def _resolve(self, key):
+        entry = self._aliases.get(key)
+        if entry is None and isinstance(key, str):
+            entry = self._products.get(key.lower())
+            if entry is not None and len(self._aliases) < self.MAX_ALIASES:
+                self._aliases[key] = entry
+        return entry
+
+    def create(self, key):
+        entry = self._resolve(key)
+        if entry is None:
+            return None
+        cls, shared = entry
+        if not shared:
+            return cls()
+        instance = self._shared.get(cls)
+        if instance is None:
+            instance = self._shared[cls] = cls()
+        return instance
+
+    def names(self):
+        return list(self._products)
+
+    def __contains__(self, key):
+        return self._resolve(key) is not None
+
+
+shape_registry = FactoryRegistry()
+color_registry = FactoryRegistry()
+
+
+# Abstract class for the Shape
+class Shape(ABC):
+    @abstractmethod
+    def draw(self):
+        pass
+
+
+# Abstract class for the Color
+class Color(ABC):
+    @abstractmethod
+    def fill(self):
+        pass
+
+
+# Concrete classes register themselves, no factory change needed for a new shape
+@shape_registry.register("circle", shared=True)
+class Circle(Shape):
+    def draw(self):
+        print("Drawing circle")
+
+
+@shape_registry.register("square", shared=True)
+class Square(Shape):
+    def draw(self):
+        print("Drawing Square")
+
+
+@shape_registry.register("rectangle", shared=True)
+class Rectangle(Shape):
+    def draw(self):
+        print("Drawing Rectangle")
+
+
+@color_registry.register("red", shared=True)
+class Red(Color):
+    def fill(self):
+        print("Inside Red::fill() method.")
+
+
+@color_registry.register("green", shared=True)
+class Green(Color):
+    def fill(self):
+        print("Inside Green::fill() method.")
+
+
+@color_registry.register("blue", shared=True)
+class Blue(Color):
+    def fill(self):
+        print("Inside Blue::fill() method.")
+
+
+# Same interface as 0-FactoryPattern.py
+class ShapeFactory:
+    def __init__(self, registry=shape_registry):
+        self._registry = registry
+
+    def getShape(self, input):
+        return self._registry.create(input)
+
+    # Same interface as the abstract factory in 1-AbstractFactoryPattern.py
+    def get_shape(self, shape_type):
+        return self._registry.create(shape_type)
+
+    def get_color(self, color_type=None):
+        return None
+
+
+class ColorFactory:
+    def __init__(self, registry=color_registry):
+        self._registry = registry
+
+    def get_color(self, color_type):
+        return self._registry.create(color_type)
+
+    def get_shape(self, shape_type=None):
+        return None
+
+
+# Builds the if/elif factory of 0-FactoryPattern.py for `names`, for comparison
+def build_chain_factory(names, classes):
+    lines = ["def getShape(input):"]
+    for i, name in enumerate(names):
+        keyword = "if" if i == 0 else "elif"
+        lines.append(f"    {keyword} input.lower() == {name!r}:")
+        lines.append(f"        return classes[{i}]()")
+    lines.append("    else:")
+    lines.append("        return None")
+    namespace = {"classes": classes}
+    exec("\n".join(lines), namespace)
+    return namespace["getShape"]
+
+
+def benchmark(product_counts=(3, 30, 300), lookups=200_000):
+    for count in product_counts:
+        registry = FactoryRegistry()
+        pooled = FactoryRegistry()
+        names = [f"shape{i}" for i in range(count)]
+        classes = []
+        for name in names:
+            cls = type(name.title(), (Shape,), {"draw": lambda self: None})
+            registry.register(name)(cls)
+            pooled.register(name, shared=True)(cls)
+            classes.append(cls)
+        chain = build_chain_factory(names, classes)
+        factory = ShapeFactory(registry)
+        pooled_factory = ShapeFactory(pooled)
+        keys = [random.choice(names).upper() for _ in range(lookups)]
+
+        results = []
+        for get_shape in (chain, factory.getShape, pooled_factory.getShape):
+            start = time.perf_counter()
+            for key in keys:
+                get_shape(key)
+            results.append(lookups / (time.perf_counter() - start))
+        print(f"{count:4} products: if/elif {results[0]:10.0f}/s, "
+              f"registry {results[1]:10.0f}/s, pooled {results[2]:10.0f}/s")
+
+
+# Example usage
+if __name__ == '__main__':
+    shapefactoryObj = ShapeFactory()
+    shapeObj1 = shapefactoryObj.getShape("circle")
+    shapeObj1.draw()
+    shapeObj2 = shapefactoryObj.getShape("SQUARE")
+    shapeObj2.draw()
+    print("Same flyweight:", shapefactoryObj.getShape("Circle") is shapeObj1)
+
+    color_factory = ColorFactory()
+    color_factory.get_color("RED").fill()
+
+    benchmark()
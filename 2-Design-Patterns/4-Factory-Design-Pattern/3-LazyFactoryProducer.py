@@ -0,0 +1,225 @@
+'''
+Memoized FactoryProducer with lazily discovered product families.
+
+FactoryProducer.get_factory in 1-AbstractFactoryPattern.py builds a new factory on every call and
+every product class has to be imported before the first object is created. Here
+
+    - get_factory() builds a factory once per choice and hands out the same one afterwards
+    - importing this module imports no product at all
+    - the products of a family are only *listed* on the first call of that factory, from
+        1. the built-in products of 1-AbstractFactoryPattern.py
+        2. installed packages exposing entry points in the group "lld_factory.<family>"
+        3. plugin directories: <plugin dir>/<family>/<product>.py, the module defines a class
+           with the same name as the file (circle.py -> class Circle)
+    - a product's module is imported the first time that product is requested
+
+Plugin directories are the "plugins" folder next to this file plus every directory listed in the
+LLD_FACTORY_PLUGINS environment variable (os.pathsep separated).
+'''
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def plugin_dirs():
+    dirs = [os.path.join(HERE, "plugins")]
+    dirs += [d for d in os.environ.get("LLD_FACTORY_PLUGINS", "").split(os.pathsep) if d]
+    return dirs
+
+
+class LazyProductFactory:
+    # family name and "KEY": "module:Class" of the products that ship with the repo
+    family = None
+    builtins = {}
+
+    def __init__(self, dirs=None):
+        self._dirs = plugin_dirs() if dirs is None else dirs
+        self._sources = None
+        self._classes = {}
+        self._lock = threading.Lock()
+
+    def _discover(self):
+        # importlib.metadata is slow to import, only pay for it on first use
+        from importlib.metadata import entry_points
+
+        sources = dict(self.builtins)
+        for ep in entry_points(group=f"lld_factory.{self.family}"):
+            sources.setdefault(ep.name.upper(), ep)
+        for directory in self._dirs:
+            family_dir = os.path.join(directory, self.family)
+            if not os.path.isdir(family_dir):
+                continue
+            # only file names are read here, nothing is imported yet
+            for entry in os.scandir(family_dir):
+                name, ext = os.path.splitext(entry.name)
+                if ext == ".py" and not name.startswith("_"):
+                    sources.setdefault(name.upper(), entry.path)
+        return sources
+
+    def _load(self, key, source):
+        if isinstance(source, str) and source.endswith(".py"):
+            module_name = f"lld_plugins.{self.family}.{key.lower()}"
+            spec = importlib.util.spec_from_file_location(module_name, source)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            for attr, value in vars(module).items():
+                if attr.upper() == key and isinstance(value, type):
+                    return value
+            raise ImportError(f"{source} does not define a class named {key.title()}")
+        if isinstance(source, str):
+            module_name, attr = source.split(":")
+            if HERE not in sys.path:
+                sys.path.insert(0, HERE)
+            return getattr(importlib.import_module(module_name), attr)
+        return source.load()
+
+    def available(self):
+        if self._sources is None:
+            with self._lock:
+                if self._sources is None:
+                    self._sources = self._discover()
+        return list(self._sources)
+
+    def create(self, key):
+        if key is None:
+            return None
+        key = key.upper()
+        cls = self._classes.get(key)
+        if cls is None:
+            self.available()
+            source = self._sources.get(key)
+            if source is None:
+                return None
+            with self._lock:
+                cls = self._classes.get(key)
+                if cls is None:
+                    cls = self._classes[key] = self._load(key, source)
+        return cls()
+
+
+class ShapeFactory(LazyProductFactory):
+    family = "shape"
+    builtins = {
+        "CIRCLE": "1-AbstractFactoryPattern:Circle",
+        "RECTANGLE": "1-AbstractFactoryPattern:Rectangle",
+        "SQUARE": "1-AbstractFactoryPattern:Square",
+    }
+
+    def get_shape(self, shape_type):
+        return self.create(shape_type)
+
+    def get_color(self, color_type=None):
+        return None
+
+
+class ColorFactory(LazyProductFactory):
+    family = "color"
+    builtins = {
+        "RED": "1-AbstractFactoryPattern:Red",
+        "GREEN": "1-AbstractFactoryPattern:Green",
+        "BLUE": "1-AbstractFactoryPattern:Blue",
+    }
+
+    def get_color(self, color_type):
+        return self.create(color_type)
+
+    def get_shape(self, shape_type=None):
+        return None
+
+
+# create a Factory generator/producer class
+# factories are built on first request and reused afterwards
+class FactoryProducer:
+    _families = {"SHAPE": ShapeFactory, "COLOR": ColorFactory}
+    _factories = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_factory(choice):
+        factory = FactoryProducer._factories.get(choice)
+        if factory is not None:
+            return factory
+        family = FactoryProducer._families.get(choice)
+        if family is None:
+            return None
+        with FactoryProducer._lock:
+            return FactoryProducer._factories.setdefault(choice, family())
+
+
+PLUGIN_TEMPLATE = '''
+class {name}:
+    def draw(self):
+        print("Inside {name}::draw() method.")
+'''
+
+COLD_START = '''
+import importlib, sys, time
+sys.path.insert(0, {here!r})
+start = time.perf_counter()
+module = importlib.import_module("3-LazyFactoryProducer")
+imported = time.perf_counter()
+factory = module.FactoryProducer.get_factory("SHAPE")
+count = len(factory.available())
+listed = time.perf_counter()
+factory.get_shape("PLUGIN{last}")
+created = time.perf_counter()
+print(imported - start, listed - imported, created - listed, count)
+'''
+
+EAGER_START = '''
+import importlib.util, os, time
+start = time.perf_counter()
+for entry in os.scandir({family_dir!r}):
+    spec = importlib.util.spec_from_file_location(entry.name[:-3], entry.path)
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+print(time.perf_counter() - start)
+'''
+
+
+def _run(code, env):
+    import subprocess
+
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return [float(value) for value in out.split()]
+
+
+def benchmark(plugin_counts=(0, 100, 500, 1000)):
+    import tempfile
+
+    for count in plugin_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            family_dir = os.path.join(directory, "shape")
+            os.mkdir(family_dir)
+            for i in range(count):
+                with open(os.path.join(family_dir, f"plugin{i}.py"), "w") as plugin:
+                    plugin.write(PLUGIN_TEMPLATE.format(name=f"Plugin{i}"))
+            env = dict(os.environ, LLD_FACTORY_PLUGINS=directory)
+
+            code = COLD_START.format(here=HERE, last=max(count - 1, 0))
+            imported, listed, created, products = _run(code, env)
+            eager = _run(EAGER_START.format(family_dir=family_dir), env)[0]
+            print(f"{count:5} plugins: import {imported * 1000:6.2f} ms, "
+                  f"list {int(products):5} products {listed * 1000:6.2f} ms, "
+                  f"first create {created * 1000:6.2f} ms | "
+                  f"eager import of all plugins {eager * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    shape_factory = FactoryProducer.get_factory("SHAPE")
+    print("Memoized:", shape_factory is FactoryProducer.get_factory("SHAPE"))
+    print("Shapes:", shape_factory.available())
+
+    shape1 = shape_factory.get_shape("CIRCLE")
+    shape1.draw()
+
+    color_factory = FactoryProducer.get_factory("COLOR")
+    color1 = color_factory.get_color("RED")
+    color1.fill()
+
+    benchmark()